@@ -302,10 +302,10 @@ class AnalysisPipeline:
             y_test.values, y_pred, y_pred_proba, 'test'
         )
         
-        # Confusion matrix plot
+        # Confusion matrix plot (reuses the matrix cached by evaluate_classification)
         cm_plot_path = os.path.join(self.output_dir, 'plots', 'traffic_confusion_matrix.png')
         traffic_evaluator.plot_confusion_matrix(
-            y_test.values, y_pred, cm_plot_path,
+            save_path=cm_plot_path,
             labels=['Level 1', 'Level 2', 'Level 3', 'Level 4', 'Level 5']
         )
         
@@ -3,8 +3,9 @@ from models.batch_processor import BatchProcessor
 from apscheduler.schedulers.background import BackgroundScheduler
 from datetime import datetime, time as dt_time
 import logging
+import signal
 import sys
-import time
+import threading
 
 
 def main():
@@ -44,35 +45,53 @@ def main():
             name='peak_hour_analysis'
         )
         
-        # Also run hourly aggregation every hour
+        # Also run hourly aggregation every hour, one minute after the :05
+        # stage merge so the just-completed hour's staged rows are already
+        # in raw_data when it runs
         scheduler.add_job(
             batch_processor.run_hourly_aggregation,
             'cron',
-            minute=5,  # Run at 5 minutes past the hour
+            minute=6,
             name='hourly_aggregation'
         )
-        
+
+        # Merge staged ingestion rows into the durable raw_data table.
+        # Cron-aligned (not a free-running interval): the :05 run is
+        # guaranteed to land between the hour boundary and the :06
+        # aggregation, so no hour is aggregated before its rows are merged
+        scheduler.add_job(
+            batch_processor.run_stage_merge,
+            'cron',
+            minute='*/5',
+            name='stage_merge'
+        )
+
         scheduler.start()
         print("⏰ Scheduled jobs:")
         print("  - Daily aggregation: 02:00 WIB")
         print("  - Peak hour analysis: 03:00 WIB")
-        print("  - Hourly aggregation: Every hour at :05")
-        
+        print("  - Hourly aggregation: Every hour at :06")
+        print("  - Stage merge: Every 5 minutes (on the clock)")
+
         # Run initial aggregation on startup
         print("\n🔄 Running initial batch processing...")
+        batch_processor.run_stage_merge()
         batch_processor.run_hourly_aggregation()
         batch_processor.run_daily_aggregation()
         batch_processor.run_peak_hour_analysis()
         print("✅ Initial batch processing complete\n")
         
-        # Keep the service running
+        # Keep the service running: block in the kernel until a stop signal
+        # instead of waking up every second just to sleep again
+        shutdown_event = threading.Event()
+        signal.signal(signal.SIGTERM, lambda *_: shutdown_event.set())
         try:
-            while True:
-                time.sleep(1)
+            shutdown_event.wait()
         except (KeyboardInterrupt, SystemExit):
-            print("\n🛑 Shutting down Batch Layer service...")
-            scheduler.shutdown()
-            sys.exit(0)
+            pass
+        print("\n🛑 Shutting down Batch Layer service...")
+        scheduler.shutdown()
+        sys.exit(0)
             
     except Exception as e:
         print(f"❌ Error starting Batch Layer service: {e}")
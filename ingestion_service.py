@@ -2,12 +2,32 @@ from models.database import DatabaseConnection
 from models.ingestion_service import IngestionService
 from models.data_models import APIConfiguration
 from utils import load_configuration
+from logging.handlers import QueueHandler, QueueListener
+import logging
+import queue
 import sys
 
 
+def _setup_logging() -> QueueListener:
+    """Route log records through a queue so stream I/O runs on the
+    listener's thread instead of blocking the ingestion/sender threads."""
+    log_queue = queue.Queue(-1)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    listener = QueueListener(log_queue, stream_handler)
+    listener.start()
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(QueueHandler(log_queue))
+    return listener
+
+
 def main():
     """Main function to start the ingestion service."""
+    listener = None
     try:
+        listener = _setup_logging()
+
         # Load configuration
         config = load_configuration()
 
@@ -26,6 +46,9 @@ def main():
     except Exception as e:
         print(f"Error starting ingestion service: {e}")
         sys.exit(1)
+    finally:
+        if listener is not None:
+            listener.stop()
 
 
 if __name__ == '__main__':
@@ -14,14 +14,35 @@ CREATE TABLE IF NOT EXISTS raw_data (
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+-- UNLOGGED staging table untuk hot ingestion path (tanpa WAL/fsync per commit).
+-- Ingestion menulis ke sini; batch job memindahkan isinya ke raw_data secara berkala.
+-- Catatan: data stage yang belum di-merge hilang saat crash (acceptable untuk telemetry).
+CREATE UNLOGGED TABLE IF NOT EXISTS raw_data_stage (
+    timestamp TIMESTAMP WITH TIME ZONE NOT NULL,
+    location VARCHAR(255),
+    latitude NUMERIC,
+    longitude NUMERIC,
+    aqi_value INTEGER,
+    aqi_category VARCHAR(50),
+    traffic_level INTEGER,
+    is_peak_hour BOOLEAN DEFAULT FALSE,
+    is_processed BOOLEAN DEFAULT FALSE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
 -- Index untuk query berdasarkan timestamp
 CREATE INDEX IF NOT EXISTS idx_raw_data_timestamp ON raw_data(timestamp DESC);
 CREATE INDEX IF NOT EXISTS idx_raw_data_location ON raw_data(location);
 CREATE INDEX IF NOT EXISTS idx_raw_data_peak_hour ON raw_data(is_peak_hour);
 
--- Tabel untuk data real-time dari Speed Layer (Recent Data)
+-- Tabel untuk data real-time dari Speed Layer (Recent Data).
+-- Partitioned by hour: retiring old data menjadi DROP TABLE O(1) pada
+-- partisi lama, bukan UPDATE/DELETE yang menyentuh setiap row.
+-- StreamProcessor membuat partisi realtime_data_YYYYMMDDHH ke depan dan
+-- menjatuhkan yang sudah lewat retensi; DEFAULT partition menampung row
+-- sebelum partisi per jam pertama dibuat.
 CREATE TABLE IF NOT EXISTS realtime_data (
-    id SERIAL PRIMARY KEY,
+    id BIGINT GENERATED BY DEFAULT AS IDENTITY,
     timestamp TIMESTAMP WITH TIME ZONE NOT NULL,
     location VARCHAR(255),
     latitude NUMERIC,
@@ -32,13 +53,26 @@ CREATE TABLE IF NOT EXISTS realtime_data (
     is_peak_hour BOOLEAN DEFAULT FALSE,  -- NEW: Peak hours detection
     processing_timestamp TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     -- Data akan expired setelah beberapa jam (cleanup oleh batch job)
-    is_active BOOLEAN DEFAULT TRUE
-);
+    is_active BOOLEAN DEFAULT TRUE,
+    -- Partition key wajib ikut dalam PK pada partitioned table
+    PRIMARY KEY (id, timestamp)
+) PARTITION BY RANGE (timestamp);
+
+CREATE TABLE IF NOT EXISTS realtime_data_default PARTITION OF realtime_data DEFAULT;
 
 CREATE INDEX IF NOT EXISTS idx_realtime_timestamp ON realtime_data(timestamp DESC);
 CREATE INDEX IF NOT EXISTS idx_realtime_active ON realtime_data(is_active);
 CREATE INDEX IF NOT EXISTS idx_realtime_peak_hour ON realtime_data(is_peak_hour);
 
+-- Partial covering index untuk speed-layer reads:
+-- get_recent_aggregates (filter timestamp + is_active, baca
+-- location/aqi/traffic) bisa dijawab index-only scan, dan cleanup UPDATE
+-- menemukan row aktif yang lama tanpa seq scan.
+CREATE INDEX IF NOT EXISTS idx_realtime_active_ts_covering
+    ON realtime_data (timestamp)
+    INCLUDE (location, aqi_value, traffic_level)
+    WHERE is_active;
+
 -- Tabel untuk hasil agregasi dari Batch Layer (Serving Layer - data historis)
 CREATE TABLE IF NOT EXISTS batch_aggregations (
     id SERIAL PRIMARY KEY,
@@ -60,6 +94,14 @@ CREATE TABLE IF NOT EXISTS batch_aggregations (
 CREATE INDEX IF NOT EXISTS idx_batch_agg_date ON batch_aggregations(date DESC);
 CREATE INDEX IF NOT EXISTS idx_batch_agg_hour ON batch_aggregations(hour);
 
+-- Partial covering index untuk peak-hour detection:
+-- query "WHERE date = ? AND hour IS NOT NULL" bisa dijawab index-only scan
+-- tanpa heap lookup karena semua kolom yang dibaca ada di index.
+CREATE INDEX IF NOT EXISTS idx_batch_agg_date_hour_covering
+    ON batch_aggregations (date, hour)
+    INCLUDE (location, avg_aqi, avg_traffic)
+    WHERE hour IS NOT NULL;
+
 -- Tabel untuk peak hours analysis dari Batch Layer
 CREATE TABLE IF NOT EXISTS peak_hours (
     id SERIAL PRIMARY KEY,
@@ -1,31 +1,161 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import os
+import time
 from typing import Dict, Any, Optional
 from .data_models import APIConfiguration
 
 
+class _TTLCache:
+    """Tiny TTL cache for API responses keyed by request parameters.
+
+    Polling every 15s re-requests data whose upstream cadence is slower
+    (traffic flow ~1min, AQI often hourly); a short TTL short-circuits
+    those identical round-trips and relieves upstream rate limits.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries = {}
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    def put(self, key, value):
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+
+
+# Upstream calls never wait longer than this; an unset timeout can block a
+# whole polling cycle on one dead endpoint
+_REQUEST_TIMEOUT = 2.0
+
+
+class _CircuitBreaker:
+    """Fail fast against an endpoint that keeps failing.
+
+    After fail_max consecutive failures the circuit opens and calls are
+    skipped (caller gets None immediately) until reset_timeout elapses,
+    at which point one probe request is allowed through.
+    """
+
+    def __init__(self, fail_max: int = 3, reset_timeout: float = 60):
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+
+    def allow(self) -> bool:
+        if self._opened_at is None:
+            return True
+        return time.monotonic() - self._opened_at >= self.reset_timeout
+
+    def record_success(self):
+        self._failures = 0
+        self._opened_at = None
+
+    def record_failure(self):
+        self._failures += 1
+        if self._failures >= self.fail_max:
+            self._opened_at = time.monotonic()
+
+
+def create_pooled_session(pool_size: int = 20) -> requests.Session:
+    """Create a Session with keep-alive pooling so repeated API calls reuse
+    the same TCP+TLS connections instead of handshaking per request.
+
+    Transient upstream failures are retried with a short backoff instead of
+    surfacing immediately into the polling loop."""
+    session = requests.Session()
+    retry = Retry(total=3, backoff_factor=0.2, status_forcelist=(429, 500, 502, 503, 504))
+    session.mount('https://', HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry
+    ))
+    return session
+
+
 class TomTomAPIClient:
     """API client for TomTom traffic data."""
-    
-    def __init__(self, config: APIConfiguration):
+
+    def __init__(self, config: APIConfiguration, session: Optional[requests.Session] = None):
         self.api_key = config.tomtom_api_key
         self.base_url = "https://api.tomtom.com/traffic/services/4/flowSegmentData/absolute/10/json"
-    
-    def get_traffic_data(self, lat: float, lon: float) -> Dict[str, Any]:
-        """Get traffic data for a specific location."""
-        url = f"{self.base_url}?point={lat},{lon}&key={self.api_key}"
-        response = requests.get(url)
-        return response.json()
+        self.session = session or create_pooled_session()
+        self.cache = _TTLCache(ttl=60)  # TomTom flow data updates on a ~minute cadence
+        self.breaker = _CircuitBreaker()
+        # Polling hits a fixed set of coordinates, so each URL is
+        # interpolated once and reused every tick
+        self._urls = {}
+
+    def _url(self, lat: float, lon: float) -> str:
+        url = self._urls.get((lat, lon))
+        if url is None:
+            url = f"{self.base_url}?point={lat},{lon}&key={self.api_key}"
+            self._urls[(lat, lon)] = url
+        return url
+
+    def get_traffic_data(self, lat: float, lon: float) -> Optional[Dict[str, Any]]:
+        """Get traffic data for a specific location.
+
+        Returns None immediately while the circuit breaker is open.
+        """
+        cached = self.cache.get((lat, lon))
+        if cached is not None:
+            return cached
+        if not self.breaker.allow():
+            return None
+        url = self._url(lat, lon)
+        try:
+            data = self.session.get(url, timeout=_REQUEST_TIMEOUT).json()
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+        self.cache.put((lat, lon), data)
+        return data
+
+    async def get_traffic_data_async(self, session, lat: float, lon: float) -> Optional[Dict[str, Any]]:
+        """Get traffic data for a specific location using an aiohttp session."""
+        cached = self.cache.get((lat, lon))
+        if cached is not None:
+            return cached
+        if not self.breaker.allow():
+            return None
+        url = self._url(lat, lon)
+        try:
+            async with session.get(url, timeout=_REQUEST_TIMEOUT) as response:
+                data = await response.json()
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+        self.cache.put((lat, lon), data)
+        return data
 
 
 class AQICNAPIClient:
     """API client for AQICN air quality data."""
     
-    def __init__(self, config: APIConfiguration):
+    def __init__(self, config: APIConfiguration, session: Optional[requests.Session] = None):
         self.token = config.aqicn_token
         self.base_url = "https://api.waqi.info/feed"
-    
-    def get_aqi_data(self, station_id: str) -> Dict[str, Any]:
+        self.session = session or create_pooled_session()
+        self.cache = _TTLCache(ttl=900)  # AQICN stations typically refresh hourly
+        self.breaker = _CircuitBreaker()
+        # Station set is fixed; interpolate each feed URL once
+        self._urls = {}
+
+    def _url(self, station_id: str) -> str:
+        url = self._urls.get(station_id)
+        if url is None:
+            url = f"{self.base_url}/{station_id}/?token={self.token}"
+            self._urls[station_id] = url
+        return url
+
+    def get_aqi_data(self, station_id: str) -> Optional[Dict[str, Any]]:
         """Get AQI data for a specific station ID.
         
         Args:
@@ -34,6 +164,35 @@ class AQICNAPIClient:
         Returns:
             Dict containing AQI data from the station
         """
-        url = f"{self.base_url}/{station_id}/?token={self.token}"
-        response = requests.get(url)
-        return response.json()
\ No newline at end of file
+        cached = self.cache.get(station_id)
+        if cached is not None:
+            return cached
+        if not self.breaker.allow():
+            return None
+        url = self._url(station_id)
+        try:
+            data = self.session.get(url, timeout=_REQUEST_TIMEOUT).json()
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+        self.cache.put(station_id, data)
+        return data
+
+    async def get_aqi_data_async(self, session, station_id: str) -> Optional[Dict[str, Any]]:
+        """Get AQI data for a specific station ID using an aiohttp session."""
+        cached = self.cache.get(station_id)
+        if cached is not None:
+            return cached
+        if not self.breaker.allow():
+            return None
+        url = self._url(station_id)
+        try:
+            async with session.get(url, timeout=_REQUEST_TIMEOUT) as response:
+                data = await response.json()
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+        self.cache.put(station_id, data)
+        return data
\ No newline at end of file
@@ -1,7 +1,13 @@
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 from .data_models import LocationData, IngestionResult
+from bisect import bisect_right
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timezone
+
+
+# Congestion-ratio bucket boundaries for traffic levels 1-5; the array
+# counterpart in fast_ops.traffic_levels uses the same cut points
+_TRAFFIC_BINS = (0.1, 0.3, 0.5, 0.7)
 
 
 class DataProcessor:
@@ -16,17 +22,10 @@ class DataProcessor:
         if free_flow_speed <= 0:
             return 1
 
+        # One sorted probe into the bucket bounds (1 = light, 5 = heavy)
+        # instead of a four-branch ladder
         ratio = (free_flow_speed - current_speed) / free_flow_speed
-        if ratio < 0.1:
-            return 1  # Light traffic
-        elif ratio < 0.3:
-            return 2
-        elif ratio < 0.5:
-            return 3
-        elif ratio < 0.7:
-            return 4
-        else:
-            return 5  # Heavy traffic
+        return 1 + bisect_right(_TRAFFIC_BINS, ratio)
 
     @staticmethod
     def normalize_aqi(aqi_value: Any) -> int:
@@ -46,14 +45,20 @@ class DataProcessor:
         lat: float,
         lon: float,
         traffic_data: Dict[str, Any],
-        aqi_data: Dict[str, Any]
+        aqi_data: Dict[str, Any],
+        batch_now: Optional[datetime] = None
     ) -> IngestionResult:
-        """Extract and process location data from API responses."""
-        current_timestamp = datetime.now()
+        """Extract and process location data from API responses.
+
+        batch_now lets callers stamp a whole polling batch with one timestamp,
+        which avoids a clock read per record and keeps all locations of a batch
+        in the same hourly aggregation bucket.
+        """
+        current_timestamp = batch_now or datetime.now(timezone.utc)
         
-        # Process traffic data
+        # Process traffic data (None means the API client's circuit is open)
         traffic_level = 1
-        if "flowSegmentData" in traffic_data:
+        if traffic_data and "flowSegmentData" in traffic_data:
             flow_data = traffic_data["flowSegmentData"]
             ff_speed = flow_data.get("freeFlowSpeed", 0)
             curr_speed = flow_data.get("currentSpeed", 0)
@@ -62,7 +67,7 @@ class DataProcessor:
         
         # Process AQI data
         aqi_value = None
-        if aqi_data.get("status") == "ok":
+        if aqi_data and aqi_data.get("status") == "ok":
             try:
                 aqi_value = int(aqi_data["data"].get("aqi"))
             except (ValueError, TypeError):
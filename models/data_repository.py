@@ -2,6 +2,29 @@ import pandas as pd
 from typing import List, Optional, Dict, Any
 from .data_models import LocationData
 from sqlalchemy import text
+from psycopg2.extras import execute_values
+
+
+# Compiled once at import time so repeated inserts reuse the same statement
+# (combined with the engine's compiled_cache this skips per-call SQL compilation)
+# Inserts target the UNLOGGED raw_data_stage table; BatchProcessor.run_stage_merge
+# moves rows into the durable raw_data table on a schedule.
+_INSERT_LOCATION_STMT = text("""
+INSERT INTO raw_data_stage
+(timestamp, location, latitude, longitude, aqi_value, aqi_category, traffic_level, is_peak_hour)
+VALUES (:timestamp, :location, :latitude, :longitude, :aqi_value, :aqi_category, :traffic_level, :is_peak_hour)
+""")
+
+# Staged rows are merged later anyway, so skip the synchronous WAL flush on commit
+_ASYNC_COMMIT_STMT = text("SET LOCAL synchronous_commit = off")
+
+# Multi-row insert for execute_values: the whole batch lands in one statement
+# (one parse/plan and one round-trip) instead of one execution per row
+_BULK_INSERT_SQL = """
+INSERT INTO raw_data_stage
+(timestamp, location, latitude, longitude, aqi_value, aqi_category, traffic_level, is_peak_hour)
+VALUES %s
+"""
 
 
 class DataRepository:
@@ -11,7 +34,7 @@ class DataRepository:
         self.db_connection = db_connection
 
     def insert_location_data(self, location_data: LocationData) -> bool:
-        """Insert location data into raw_data table with peak hours and AQI category."""
+        """Insert location data into the raw_data_stage table with peak hours and AQI category."""
         conn = None
         try:
             conn = self.db_connection.get_connection()
@@ -25,13 +48,8 @@ class DataRepository:
             is_peak = StreamProcessor.is_peak_hour(location_data.timestamp)
             aqi_category = StreamProcessor.get_aqi_category(location_data.aqi_value) if location_data.aqi_value else "Unknown"
 
-            insert_query = text("""
-            INSERT INTO raw_data 
-            (timestamp, location, latitude, longitude, aqi_value, aqi_category, traffic_level, is_peak_hour)
-            VALUES (:timestamp, :location, :latitude, :longitude, :aqi_value, :aqi_category, :traffic_level, :is_peak_hour)
-            """)
-
-            conn.execute(insert_query, {
+            conn.execute(_ASYNC_COMMIT_STMT)
+            conn.execute(_INSERT_LOCATION_STMT, {
                 'timestamp': location_data.timestamp,
                 'location': location_data.location,
                 'latitude': location_data.latitude,
@@ -54,6 +72,57 @@ class DataRepository:
             if conn:
                 conn.close()
 
+    def insert_location_data_bulk(self, rows: List[LocationData]) -> bool:
+        """Insert a batch of location data rows in one executemany round-trip.
+
+        Collapses the per-location insert traffic of a polling tick into a
+        single multi-row statement against raw_data_stage via
+        psycopg2.extras.execute_values (one parse and one round-trip total).
+        """
+        if not rows:
+            return True
+
+        conn = None
+        try:
+            engine = self.db_connection.get_engine()
+            if not engine:
+                return False
+
+            from .stream_processor import StreamProcessor
+
+            values = [
+                (
+                    row.timestamp,
+                    row.location,
+                    row.latitude,
+                    row.longitude,
+                    row.aqi_value,
+                    StreamProcessor.get_aqi_category(row.aqi_value) if row.aqi_value else "Unknown",
+                    row.traffic_level,
+                    StreamProcessor.is_peak_hour(row.timestamp)
+                )
+                for row in rows
+            ]
+
+            # Drop to the driver level: execute_values expands the batch into
+            # one INSERT ... VALUES (...), (...), ... statement
+            conn = engine.raw_connection()
+            with conn.cursor() as cursor:
+                cursor.execute("SET LOCAL synchronous_commit = off")
+                execute_values(cursor, _BULK_INSERT_SQL, values)
+            conn.commit()
+            return True
+
+        except Exception as e:
+            print(f"Database Error: {e}")
+            if conn:
+                conn.rollback()
+            return False
+
+        finally:
+            if conn:
+                conn.close()
+
     def get_realtime_heatmap_data(self) -> tuple:
         """Get the latest 100 records for heatmap visualization."""
         try:
@@ -1,5 +1,6 @@
 import os
 from typing import Optional
+import random
 import time
 import logging
 from sqlalchemy import create_engine, text
@@ -33,7 +34,8 @@ class DatabaseConnection:
                     max_overflow=20,
                     pool_pre_ping=True,  # Verify connections before use
                     pool_recycle=3600,    # Recycle connections every hour
-                    echo=False           # Set to True for SQL debug logging
+                    echo=False,          # Set to True for SQL debug logging
+                    execution_options={"compiled_cache": {}}  # Cache compiled statements across calls
                 )
                 # Test the connection
                 with self.engine.connect() as conn:
@@ -43,8 +45,11 @@ class DatabaseConnection:
                 return
             except Exception as e:
                 if attempt < max_retries - 1:
-                    logging.warning(f"❌ Gagal membuat SQLAlchemy engine pada percobaan ke-{attempt + 1}: {e}. Mencoba ulang dalam {delay} detik...")
-                    time.sleep(delay)
+                    # Exponential backoff with jitter so workers restarting at the
+                    # same time (e.g. Lambda cold start) don't retry in lockstep
+                    sleep_s = min(30, delay * (2 ** attempt)) + random.uniform(0, delay)
+                    logging.warning(f"❌ Gagal membuat SQLAlchemy engine pada percobaan ke-{attempt + 1}: {e}. Mencoba ulang dalam {sleep_s:.1f} detik...")
+                    time.sleep(sleep_s)
                 else:
                     logging.error(f"❌ Gagal membuat SQLAlchemy engine setelah {max_retries} percobaan: {e}")
                     raise e
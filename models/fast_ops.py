@@ -0,0 +1,147 @@
+import numpy as np
+
+# Numba is optional: backfills fall back to a vectorized NumPy path without it
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# AQI category names indexed by the codes returned from aqi_category_codes
+AQI_CATEGORIES = (
+    "Good",
+    "Moderate",
+    "Unhealthy for Sensitive Groups",
+    "Unhealthy",
+    "Very Unhealthy",
+    "Hazardous",
+)
+
+# Upper bounds of each AQI category (last category is open-ended)
+_AQI_BOUNDS = np.array([50, 100, 150, 200, 300], dtype=np.float32)
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _iqr_mask_jit(x, lo, hi, out):
+        for i in prange(len(x)):
+            v = x[i]
+            out[i] = (v >= lo) & (v <= hi)
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _grouped_multi_ma_jit(values, group_starts, out3, out6, out24):
+        for g in prange(len(group_starts) - 1):
+            s, e = group_starts[g], group_starts[g + 1]
+            sum3 = sum6 = sum24 = 0.0
+            for i in range(s, e):
+                v = values[i]
+                sum3 += v
+                sum6 += v
+                sum24 += v
+                k = i - s
+                if k >= 3:
+                    sum3 -= values[i - 3]
+                if k >= 6:
+                    sum6 -= values[i - 6]
+                if k >= 24:
+                    sum24 -= values[i - 24]
+                out3[i] = sum3 / min(k + 1, 3)
+                out6[i] = sum6 / min(k + 1, 6)
+                out24[i] = sum24 / min(k + 1, 24)
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _traffic_levels_jit(ff, cs, out):
+        for i in prange(len(ff)):
+            if ff[i] > 0:
+                r = (ff[i] - cs[i]) / ff[i]
+            else:
+                r = 0.0
+            # Branchless equivalent of DataProcessor.calculate_traffic_level
+            out[i] = 1 + (r >= 0.1) + (r >= 0.3) + (r >= 0.5) + (r >= 0.7)
+
+
+def traffic_levels(free_flow_speeds, current_speeds) -> np.ndarray:
+    """Compute traffic levels (1-5) for whole arrays of speed pairs.
+
+    Batch counterpart of DataProcessor.calculate_traffic_level for historical
+    backfills and migrations. Uses a parallel Numba kernel when available,
+    otherwise a vectorized NumPy fallback.
+    """
+    ff = np.ascontiguousarray(free_flow_speeds, dtype=np.float32)
+    cs = np.ascontiguousarray(current_speeds, dtype=np.float32)
+
+    if NUMBA_AVAILABLE:
+        out = np.empty(len(ff), dtype=np.int8)
+        _traffic_levels_jit(ff, cs, out)
+        return out
+
+    ratio = np.where(ff > 0, (ff - cs) / np.where(ff > 0, ff, 1), 0.0)
+    return (
+        1 + (ratio >= 0.1) + (ratio >= 0.3) + (ratio >= 0.5) + (ratio >= 0.7)
+    ).astype(np.int8)
+
+
+def grouped_multi_ma(values, group_starts):
+    """Trailing 3/6/24-step means for every sorted group in one fused pass.
+
+    Running-sum algorithm: each step is an O(1) add/subtract per window, and
+    all three window sums advance in lockstep so the values array is read
+    once instead of once per window. Requires numba — callers should check
+    NUMBA_AVAILABLE and fall back to per-window rolling without it.
+
+    Args:
+        values: float64 array, sorted so each group is contiguous
+        group_starts: int64 boundaries, [0, ..., len(values)]
+
+    Returns:
+        Tuple of (ma_3, ma_6, ma_24) float64 arrays
+    """
+    if not NUMBA_AVAILABLE:
+        raise RuntimeError("grouped_multi_ma requires numba; check NUMBA_AVAILABLE first")
+
+    x = np.ascontiguousarray(values, dtype=np.float64)
+    out3 = np.empty(len(x), dtype=np.float64)
+    out6 = np.empty(len(x), dtype=np.float64)
+    out24 = np.empty(len(x), dtype=np.float64)
+    _grouped_multi_ma_jit(x, np.asarray(group_starts, dtype=np.int64), out3, out6, out24)
+    return out3, out6, out24
+
+
+def tukey_fence_mask(values, threshold: float = 3.0):
+    """Build a keep-mask for Tukey's IQR fence over an array of values.
+
+    Batch counterpart of the quantile-based outlier filter: quartiles come
+    from np.partition (quickselect, O(N)) instead of two full sorts, and the
+    mask is built in one fused pass (parallel Numba kernel when available).
+
+    Returns:
+        Tuple of (mask, lower_bound, upper_bound)
+    """
+    x = np.ascontiguousarray(values, dtype=np.float64)
+    n = len(x)
+    if n == 0:
+        return np.ones(0, dtype=bool), -np.inf, np.inf
+
+    q1_idx, q3_idx = n // 4, (3 * n) // 4
+    part = np.partition(x, (q1_idx, q3_idx))
+    q1, q3 = part[q1_idx], part[q3_idx]
+    iqr = q3 - q1
+    lo = q1 - threshold * iqr
+    hi = q3 + threshold * iqr
+
+    if NUMBA_AVAILABLE:
+        mask = np.empty(n, dtype=np.bool_)
+        _iqr_mask_jit(x, lo, hi, mask)
+    else:
+        mask = (x >= lo) & (x <= hi)
+    return mask, lo, hi
+
+
+def aqi_category_codes(aqi_values) -> np.ndarray:
+    """Map arrays of AQI values to category codes (indexes into AQI_CATEGORIES).
+
+    Batch counterpart of StreamProcessor.get_aqi_category; a single
+    searchsorted pass replaces per-row if/elif chains.
+    """
+    aqi = np.ascontiguousarray(aqi_values, dtype=np.float32)
+    return np.searchsorted(_AQI_BOUNDS, aqi, side='left').astype(np.int8)
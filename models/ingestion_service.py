@@ -1,14 +1,60 @@
-from .api_client import TomTomAPIClient, AQICNAPIClient
+from .api_client import TomTomAPIClient, AQICNAPIClient, create_pooled_session
 from .data_processor import DataProcessor
 from .data_repository import DataRepository
-from .data_models import APIConfiguration, IngestionResult
-from .kafka_producer import KafkaProducerWrapper
-import time
+from .data_models import APIConfiguration, IngestionResult, LocationData
+from .kafka_producer import get_producer
+import asyncio
+import aiohttp
+import numpy as np
+import queue
+import signal
+import threading
 from apscheduler.schedulers.background import BackgroundScheduler
-from typing import List, Dict, Any
-from datetime import datetime
+from apscheduler.executors.pool import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional
+from datetime import datetime, timezone
 import logging
 
+try:
+    import msgspec
+
+    class _LocationMsg(msgspec.Struct):
+        """Slotted in-flight Kafka payload; encodes to the same JSON wire
+        format as the dict fallback but without per-field hashing."""
+        timestamp: str
+        timestamp_ms: int
+        location: str
+        latitude: float
+        longitude: float
+        aqi_value: Optional[int]
+        traffic_level: Optional[float]
+except ImportError:
+    msgspec = None
+
+
+# Deferred %s formatting: nothing is built when the level is disabled, and the
+# service main routes records through a QueueListener so log I/O never blocks
+# the ingestion or sender threads
+logger = logging.getLogger(__name__)
+
+
+# Default locations for polling, as (id_station, lat, lon, name) tuples.
+# Module-level constant: built once per process instead of per service instance,
+# and tuples are far smaller than the equivalent list of dicts.
+# Note: id_station is used for AQICN API, lat/lon are used for TomTom API
+_POLLING_LOCATIONS = (
+    ("A521365", -6.1861, 106.8236, "Kebon Sirih"),
+    ("A495982", -6.1593, 106.8180, "Krukut"),
+    ("A416842", -6.2154, 106.8030, "GBK, Gelora"),
+    ("A531565", -6.2338, 106.8769, "Jakarta Timur Kebon Nanas"),
+    ("A515938", -6.1756, 106.6449, "Tangerang Benteng Betawi"),
+    ("A521380", -6.1714, 106.7622, "Kedoya Utara"),
+    ("A570235", -6.2224, 106.7883, "Grogol Utara"),
+    ("A537937", -6.2373, 106.7861, "Gunung"),
+    ("A511573", -6.3498, 106.7782, "Cinere"),
+    ("@8294", -6.1911, 106.8491, "Kemayoran"),
+)
+
 
 class IngestionService:
     """Service class for data ingestion from APIs to Kafka (Lambda Architecture - Ingestion Layer)."""
@@ -16,90 +62,242 @@ class IngestionService:
     def __init__(self, db_connection, config: APIConfiguration):
         self.db_connection = db_connection
         self.config = config
-        self.tomtom_client = TomTomAPIClient(config)
-        self.aqicn_client = AQICNAPIClient(config)
+        # One pooled session shared by both clients: TCP+TLS is established
+        # once and reused across locations and scheduler ticks
+        self._http = create_pooled_session()
+        self.tomtom_client = TomTomAPIClient(config, session=self._http)
+        self.aqicn_client = AQICNAPIClient(config, session=self._http)
         self.data_processor = DataProcessor()
         self.repository = DataRepository(db_connection)
         
-        # Initialize Kafka Producer
-        self.kafka_producer = KafkaProducerWrapper()
+        # Shared per-process Kafka Producer (lazy broker discovery)
+        self.kafka_producer = get_producer()
+
+        # Set to stop the scheduler loop (by SIGTERM or KeyboardInterrupt)
+        self._stop_event = threading.Event()
+
+        # Persistent event loop + aiohttp session so the async fetch path also
+        # keeps its connections alive across scheduler ticks
+        self._loop = None
+        self._aiohttp_session = None
+
+        # Decouple the polling tick from Kafka/DB latency: ticks enqueue
+        # payloads and return; the sender thread drains, batches and persists.
+        # Bounded so a dead broker applies backpressure instead of eating RAM.
+        self._send_queue = queue.Queue(maxsize=10000)
+        self._sender_thread = threading.Thread(target=self._sender_loop, daemon=True)
+        self._sender_thread.start()
         
-        # Default locations for polling
-        # Note: id_station is used for AQICN API, lat/lon are used for TomTom API
-        self.polling_locations = [
-            {"id_station": "A521365", "lat": -6.1861, "lon": 106.8236, "name": "Kebon Sirih"},
-            {"id_station": "A495982", "lat": -6.1593, "lon": 106.8180, "name": "Krukut"},
-            {"id_station": "A416842", "lat": -6.2154, "lon": 106.8030, "name": "GBK, Gelora"},
-            {"id_station": "A531565", "lat": -6.2338, "lon": 106.8769, "name": "Jakarta Timur Kebon Nanas"},
-            {"id_station": "A515938", "lat": -6.1756, "lon": 106.6449, "name": "Tangerang Benteng Betawi"},
-            {"id_station": "A521380", "lat": -6.1714, "lon": 106.7622, "name": "Kedoya Utara"},
-            {"id_station": "A570235", "lat": -6.2224, "lon": 106.7883, "name": "Grogol Utara"},
-            {"id_station": "A537937", "lat": -6.2373, "lon": 106.7861, "name": "Gunung"},
-            {"id_station": "A511573", "lat": -6.3498, "lon": 106.7782, "name": "Cinere"},
-            {"id_station": "@8294", "lat": -6.1911, "lon": 106.8491, "name": "Kemayoran"}
-        ]
-    
+        # Locations to poll (see _POLLING_LOCATIONS at module scope)
+        self.polling_locations = _POLLING_LOCATIONS
+
+        # Structure-of-arrays view of polling_locations, built once so the hot
+        # loop indexes parallel arrays instead of unpacking a struct per tick
+        self._stations, lats, lons, names = zip(*self.polling_locations)
+        self._lats = np.array(lats, dtype=np.float64)
+        self._lons = np.array(lons, dtype=np.float64)
+        self._names = list(names)
+
+        # Kafka partition keys encoded once; the producer accepts bytes
+        # directly so no per-message encode is needed
+        self._location_keys = {name: name.encode('utf-8') for name in self._names}
+
+    async def _fetch_location(self, session, index: int):
+        """Fetch traffic and AQI data for one location concurrently.
+
+        TomTom uses lat/lon, AQICN uses station_id.
+        """
+        return await asyncio.gather(
+            self.tomtom_client.get_traffic_data_async(session, self._lats[index], self._lons[index]),
+            self.aqicn_client.get_aqi_data_async(session, self._stations[index])
+        )
+
+    async def _ensure_session(self) -> aiohttp.ClientSession:
+        """Return the shared aiohttp session, creating it on first use."""
+        if self._aiohttp_session is None or self._aiohttp_session.closed:
+            connector = aiohttp.TCPConnector(limit=20)
+            self._aiohttp_session = aiohttp.ClientSession(connector=connector)
+        return self._aiohttp_session
+
+    async def _fetch_all(self):
+        """Fetch all polling locations in parallel over one connection pool."""
+        session = await self._ensure_session()
+        return await asyncio.gather(
+            *[self._fetch_location(session, i) for i in range(len(self._names))],
+            return_exceptions=True
+        )
+
+    def _run_async(self, coro):
+        """Run a coroutine on the service's persistent event loop.
+
+        Reusing one loop (instead of asyncio.run per tick) keeps the aiohttp
+        session and its keep-alive connections valid between ticks.
+        """
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(coro)
+
+    def _drain_queue(self, block: bool = True) -> list:
+        """Pull everything currently queued, waiting briefly for the first item."""
+        batch = []
+        try:
+            batch.append(self._send_queue.get(timeout=1) if block else self._send_queue.get_nowait())
+        except queue.Empty:
+            return batch
+        while True:
+            try:
+                batch.append(self._send_queue.get_nowait())
+            except queue.Empty:
+                return batch
+
+    def _deliver_batch(self, batch: list):
+        """Send a drained batch to Kafka (one flush) and bulk-insert the acks."""
+        pending_sends = []
+        for ingestion_result, message_payload, location_data in batch:
+            kafka_future = self.kafka_producer.send_message_async(
+                message_payload, key=self._location_keys[ingestion_result.location]
+            )
+            pending_sends.append((ingestion_result, kafka_future, location_data))
+
+        # One flush delivers the whole batch in a single produce request,
+        # then each future tells us whether the broker acknowledged the record
+        self.kafka_producer.flush()
+
+        acknowledged = []
+        for ingestion_result, kafka_future, location_data in pending_sends:
+            try:
+                kafka_future.get(timeout=5)
+                acknowledged.append((ingestion_result, location_data))
+            except Exception as e:
+                logger.error("❌ Kafka error sending message: %s", e)
+                ingestion_result.success = False
+                ingestion_result.error_message = "Failed to send to Kafka"
+
+        # Also save to raw_data for backup and batch processing
+        # (Lambda Architecture - All Data path); one bulk insert per batch
+        # instead of one DB round-trip per location
+        db_success = self.repository.insert_location_data_bulk(
+            [location_data for _, location_data in acknowledged]
+        )
+        for ingestion_result, _ in acknowledged:
+            ingestion_result.success = db_success
+            if not db_success:
+                ingestion_result.error_message = "Failed to insert into database"
+
+        for ingestion_result, _, _ in pending_sends:
+            if ingestion_result.success:
+                logger.info("✅ Ingest→Kafka: %s | AQI: %s | Traffic: %s",
+                            ingestion_result.location, ingestion_result.aqi_value,
+                            ingestion_result.traffic_level)
+            else:
+                logger.warning("❌ Skip %s: %s", ingestion_result.location,
+                               ingestion_result.error_message)
+
+    def _sender_loop(self):
+        """Daemon loop draining the send queue in batches.
+
+        A slow broker or database stretches this loop, not the scheduler tick
+        that produced the data, so the polling cadence stays intact. Delivery
+        errors are logged and the batch dropped — the thread must outlive any
+        broker outage, or the queue fills and every later tick is lost too.
+        """
+        while not self._stop_event.is_set():
+            batch = self._drain_queue()
+            if batch:
+                try:
+                    self._deliver_batch(batch)
+                except Exception as e:
+                    logger.error("❌ Sender batch failed, dropping %d records: %s",
+                                 len(batch), e, exc_info=True)
+        # Final non-blocking drain so rows queued just before shutdown land
+        batch = self._drain_queue(block=False)
+        if batch:
+            try:
+                self._deliver_batch(batch)
+            except Exception as e:
+                logger.error("❌ Sender batch failed during shutdown, dropping %d records: %s",
+                             len(batch), e)
+
     def fetch_and_insert_data(self) -> List[IngestionResult]:
-        """Fetch data from APIs and publish to Kafka (and also backup to raw_data)."""
+        """Fetch data from APIs and hand it to the sender thread.
+
+        Kafka publication and the raw_data backup insert happen on the sender
+        thread; this tick only fetches and enqueues.
+        """
         results = []
-        
-        for location in self.polling_locations:
-            lat = location["lat"]
-            lon = location["lon"]
-            name = location["name"]
-            id_station = location["id_station"]
-            
+
+        # One timestamp per polling batch: cheaper than a clock read per record
+        # and keeps the whole batch in the same aggregation window
+        batch_now = datetime.now(timezone.utc)
+
+        # All API round-trips fly concurrently, so a tick costs roughly one
+        # round-trip instead of two per location in sequence
+        fetched = self._run_async(self._fetch_all())
+
+        for i, api_data in enumerate(fetched):
+            lat = float(self._lats[i])
+            lon = float(self._lons[i])
+            name = self._names[i]
+
             try:
-                # Fetch data from APIs
-                # TomTom uses lat/lon, AQICN uses station_id
-                traffic_data = self.tomtom_client.get_traffic_data(lat, lon)
-                aqi_data = self.aqicn_client.get_aqi_data(id_station)
-                
+                if isinstance(api_data, Exception):
+                    raise api_data
+                traffic_data, aqi_data = api_data
+
                 # Extract and process data
                 ingestion_result = DataProcessor.extract_location_data(
-                    name, lat, lon, traffic_data, aqi_data
+                    name, lat, lon, traffic_data, aqi_data, batch_now=batch_now
                 )
-                
+
                 if ingestion_result.success:
-                    # Create message payload
-                    timestamp = datetime.now()
-                    message_payload = {
-                        'timestamp': timestamp.isoformat(),
-                        'location': name,
-                        'latitude': float(lat),
-                        'longitude': float(lon),
-                        'aqi_value': ingestion_result.aqi_value,
-                        'traffic_level': ingestion_result.traffic_level
-                    }
-                    
-                    # Send to Kafka (primary path)
-                    kafka_success = self.kafka_producer.send_location_data(message_payload)
-                    
-                    # Also save to raw_data for backup and batch processing (Lambda Architecture - All Data path)
-                    if kafka_success:
-                        from .data_models import LocationData
-                        location_data = LocationData(
-                            timestamp=timestamp,
+                    # Create message payload (slotted struct when msgspec is
+                    # installed: fewer allocations, direct C encode)
+                    # timestamp_ms rides along so consumers can skip the ISO
+                    # parse; the string field stays for older consumers
+                    timestamp = batch_now
+                    timestamp_ms = int(timestamp.timestamp() * 1000)
+                    if msgspec is not None:
+                        message_payload = _LocationMsg(
+                            timestamp=timestamp.isoformat(),
+                            timestamp_ms=timestamp_ms,
                             location=name,
                             latitude=lat,
                             longitude=lon,
                             aqi_value=ingestion_result.aqi_value,
                             traffic_level=ingestion_result.traffic_level
                         )
-                        db_success = self.repository.insert_location_data(location_data)
-                        ingestion_result.success = kafka_success and db_success
                     else:
+                        message_payload = {
+                            'timestamp': timestamp.isoformat(),
+                            'timestamp_ms': timestamp_ms,
+                            'location': name,
+                            'latitude': lat,
+                            'longitude': lon,
+                            'aqi_value': ingestion_result.aqi_value,
+                            'traffic_level': ingestion_result.traffic_level
+                        }
+                    
+                    location_data = LocationData(
+                        timestamp=timestamp,
+                        location=name,
+                        latitude=lat,
+                        longitude=lon,
+                        aqi_value=ingestion_result.aqi_value,
+                        traffic_level=ingestion_result.traffic_level
+                    )
+                    # Hand off to the sender thread; a full queue means the
+                    # broker has been down long enough that dropping is honest
+                    try:
+                        self._send_queue.put_nowait((ingestion_result, message_payload, location_data))
+                    except queue.Full:
                         ingestion_result.success = False
-                        ingestion_result.error_message = "Failed to send to Kafka"
-                
-                results.append(ingestion_result)
-                
-                # Log the result
-                if ingestion_result.success:
-                    print(f"✅ Ingest→Kafka: {name} | AQI: {ingestion_result.aqi_value} | Traffic: {ingestion_result.traffic_level}")
+                        ingestion_result.error_message = "Send queue full"
+                        logger.warning("❌ Skip %s: send queue full", name)
                 else:
-                    print(f"❌ Skip {name}: {ingestion_result.error_message}")
-                    
+                    logger.warning("❌ Skip %s: %s", name, ingestion_result.error_message)
+
+                results.append(ingestion_result)
+
             except Exception as e:
                 error_result = IngestionResult(
                     location=name,
@@ -109,21 +307,40 @@ class IngestionService:
                     error_message=str(e)
                 )
                 results.append(error_result)
-                print(f"❌ Error processing {name}: {e}")
-        
+                logger.error("❌ Error processing %s: %s", name, e)
+
         return results
     
     def start_scheduler(self, interval_seconds: int = 15):
         """Start the background scheduler for periodic data ingestion."""
-        scheduler = BackgroundScheduler()
+        # Multiple workers so a long tick doesn't starve future jobs; ticks
+        # themselves stay serialized (max_instances=1) because the fetch path
+        # shares one event loop, and coalesce collapses any missed runs into one
+        scheduler = BackgroundScheduler(
+            executors={'default': ThreadPoolExecutor(4)},
+            job_defaults={'coalesce': True, 'max_instances': 1, 'misfire_grace_time': 10}
+        )
         scheduler.add_job(self.fetch_and_insert_data, 'interval', seconds=interval_seconds)
         scheduler.start()
         print("🚀 Ingestion Service Scheduler Started (Kafka Producer + Multi-Location)...")
 
+        # Let Docker/Kubernetes SIGTERM unblock the wait for a clean shutdown
+        signal.signal(signal.SIGTERM, lambda *_: self._stop_event.set())
+
         try:
-            while True:
-                time.sleep(1)
+            # Block without waking up: the scheduler runs on its own thread,
+            # so the main thread only needs to wait for a stop signal
+            self._stop_event.wait()
         except (KeyboardInterrupt, SystemExit):
-            print("🛑 Shutting down ingestion service...")
-            self.kafka_producer.close()
-            scheduler.shutdown()
\ No newline at end of file
+            pass
+
+        print("🛑 Shutting down ingestion service...")
+        scheduler.shutdown()
+        self._stop_event.set()
+        self._sender_thread.join(timeout=10)
+        if self._aiohttp_session is not None and not self._aiohttp_session.closed:
+            self._run_async(self._aiohttp_session.close())
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.close()
+        self._http.close()
+        self.kafka_producer.close()
\ No newline at end of file
@@ -5,6 +5,18 @@ from kafka import KafkaConsumer
 from kafka.errors import KafkaError
 import os
 
+try:
+    import orjson  # Optional: C-accelerated JSON for the per-record deserializer
+except ImportError:
+    orjson = None
+
+
+def _deserialize_value(raw: bytes) -> Dict[str, Any]:
+    """Deserialize JSON message bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode('utf-8'))
+
 
 class KafkaConsumerWrapper:
     """Wrapper class for Kafka Consumer with error handling and deserialization."""
@@ -31,11 +43,10 @@ class KafkaConsumerWrapper:
                 self.topic,
                 bootstrap_servers=self.bootstrap_servers.split(','),
                 group_id=self.group_id,
-                value_deserializer=lambda m: json.loads(m.decode('utf-8')),
+                value_deserializer=_deserialize_value,
                 key_deserializer=lambda k: k.decode('utf-8') if k else None,
                 auto_offset_reset='latest',  # Start from latest messages for real-time processing
-                enable_auto_commit=True,     # Auto-commit offsets
-                auto_commit_interval_ms=1000,  # Commit every second
+                enable_auto_commit=False,    # Offsets committed once per poll batch
                 max_poll_records=100         # Batch size for processing
             )
             logging.info(f"✅ Kafka Consumer initialized: {self.bootstrap_servers}, topic: {self.topic}, group: {self.group_id}")
@@ -45,21 +56,38 @@ class KafkaConsumerWrapper:
     
     def consume_messages(self) -> Iterator[Dict[str, Any]]:
         """
-        Consume messages from Kafka topic.
-        
+        Consume messages from Kafka topic in poll batches.
+
+        Offsets are committed once after each poll batch is fully yielded
+        (at-least-once: an exception mid-batch means the batch is redelivered)
+        instead of on the auto-commit timer.
+
+        Empty polls yield a None sentinel so consumers with time-based
+        batching (see StreamProcessor.consume_in_batches) can flush a
+        partial batch while the topic is quiet instead of waiting for the
+        next message to arrive.
+
         Yields:
-            Dict containing message data
+            Dict containing message data, or None after an empty poll
         """
         try:
-            for message in self.consumer:
-                yield {
-                    'topic': message.topic,
-                    'partition': message.partition,
-                    'offset': message.offset,
-                    'key': message.key,
-                    'value': message.value,
-                    'timestamp': message.timestamp
-                }
+            while True:
+                batch = self.consumer.poll(timeout_ms=1000)
+                if not batch:
+                    yield None
+                    continue
+                for records in batch.values():
+                    for message in records:
+                        yield {
+                            'topic': message.topic,
+                            'partition': message.partition,
+                            'offset': message.offset,
+                            'key': message.key,
+                            'value': message.value,
+                            'timestamp': message.timestamp
+                        }
+                # One OffsetCommit per batch, not one per auto-commit tick
+                self.consumer.commit()
         except KafkaError as e:
             logging.error(f"❌ Kafka error consuming messages: {e}")
         except Exception as e:
@@ -70,9 +98,13 @@ class KafkaConsumerWrapper:
         Consume location data messages from Kafka.
         
         Yields:
-            Dict containing location data (location, AQI, traffic, etc.)
+            Dict containing location data (location, AQI, traffic, etc.),
+            or None after an empty poll (passed through from consume_messages)
         """
         for message in self.consume_messages():
+            if message is None:
+                yield None
+                continue
             try:
                 location_data = message['value']
                 logging.debug(f"📨 Received: {location_data.get('location', 'Unknown')} from partition {message['partition']}")
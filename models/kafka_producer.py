@@ -1,10 +1,35 @@
 import json
 import logging
+import threading
 from typing import Dict, Any, Optional
 from kafka import KafkaProducer
 from kafka.errors import KafkaError
 import os
 
+try:
+    import orjson  # Optional: C-accelerated JSON for the per-record serializer
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec  # Optional: zero-overhead encoding of slotted payload structs
+    _msgspec_encode = msgspec.json.Encoder().encode
+except ImportError:
+    msgspec = None
+
+
+def _serialize_value(value) -> bytes:
+    """Serialize a message value to JSON bytes.
+
+    msgspec Structs encode directly; dicts go through orjson when available,
+    stdlib json otherwise. All three produce the same wire format.
+    """
+    if msgspec is not None and isinstance(value, msgspec.Struct):
+        return _msgspec_encode(value)
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value).encode('utf-8')
+
 
 class KafkaProducerWrapper:
     """Wrapper class for Kafka Producer with error handling and serialization."""
@@ -27,12 +52,15 @@ class KafkaProducerWrapper:
         try:
             self.producer = KafkaProducer(
                 bootstrap_servers=self.bootstrap_servers.split(','),
-                value_serializer=lambda v: json.dumps(v).encode('utf-8'),
-                key_serializer=lambda k: k.encode('utf-8') if k else None,
+                value_serializer=_serialize_value,
+                # Keys arrive as bytes (callers cache the encoded form); no
+                # key_serializer means no per-message encode call
                 acks='all',  # Wait for all replicas to acknowledge
                 retries=3,   # Retry failed sends
-                max_in_flight_requests_per_connection=1,  # Ensure ordering
-                compression_type='gzip'  # Compress messages
+                batch_size=262144,    # 256KB batches amortize broker round-trips
+                linger_ms=100,        # Wait up to 100ms to fill a batch
+                max_in_flight_requests_per_connection=5,  # Pipeline requests per broker
+                compression_type='lz4'  # 3-10x faster than gzip at similar ratios
             )
             logging.info(f"✅ Kafka Producer initialized: {self.bootstrap_servers}")
         except Exception as e:
@@ -52,8 +80,10 @@ class KafkaProducerWrapper:
             bool: True if successful, False otherwise
         """
         target_topic = topic or self.topic
-        
+
         try:
+            if isinstance(key, str):
+                key = key.encode('utf-8')
             future = self.producer.send(target_topic, value=message, key=key)
             # Wait for confirmation (with timeout)
             record_metadata = future.get(timeout=10)
@@ -72,6 +102,58 @@ class KafkaProducerWrapper:
             logging.error(f"❌ Unexpected error sending message: {e}")
             return False
     
+    def send_message_async(self, message: Dict[str, Any], topic: str = None, key: str = None):
+        """
+        Queue a message without waiting for the broker acknowledgment.
+
+        Callers batching multiple messages should call flush() once at the end
+        and resolve the returned futures to check delivery.
+
+        Args:
+            message: Dictionary to send as JSON
+            topic: Topic name (optional, uses default if not provided)
+            key: Message key for partitioning (optional)
+
+        Returns:
+            FutureRecordMetadata for the queued send
+        """
+        target_topic = topic or self.topic
+        if isinstance(key, str):
+            key = key.encode('utf-8')
+        return self.producer.send(target_topic, value=message, key=key)
+
+    def send_location_data_async(self, location_data: Dict[str, Any]):
+        """
+        Queue location data for Kafka without blocking on the acknowledgment.
+
+        Args:
+            location_data: Dictionary containing location, AQI, and traffic data
+
+        Returns:
+            FutureRecordMetadata for the queued send
+        """
+        # Use location name as key for partitioning (keeps same location in same partition)
+        key = location_data.get('location', '') if isinstance(location_data, dict) else location_data.location
+        return self.send_message_async(location_data, key=key)
+
+    def send_location_batch(self, location_data_list) -> list:
+        """
+        Queue a list of location data messages, then flush once.
+
+        All sends ride the producer's batching (batch_size/linger_ms) and the
+        single flush delivers them together instead of one ack wait per record.
+
+        Args:
+            location_data_list: List of location data dictionaries
+
+        Returns:
+            List of FutureRecordMetadata, one per queued message
+        """
+        futures = [self.send_location_data_async(data) for data in location_data_list]
+        if futures:
+            self.producer.flush()
+        return futures
+
     def send_location_data(self, location_data: Dict[str, Any]) -> bool:
         """
         Send location data message to Kafka.
@@ -105,3 +187,20 @@ class KafkaProducerWrapper:
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit."""
         self.close()
+
+
+# Process-wide producer, created lazily on first use. Broker discovery and
+# metadata fetch happen once per process instead of once per service object,
+# and warm container reuse gets an already-connected producer.
+_producer_singleton: Optional[KafkaProducerWrapper] = None
+_producer_lock = threading.Lock()
+
+
+def get_producer() -> KafkaProducerWrapper:
+    """Return the shared per-process KafkaProducerWrapper, creating it lazily."""
+    global _producer_singleton
+    if _producer_singleton is None:
+        with _producer_lock:
+            if _producer_singleton is None:
+                _producer_singleton = KafkaProducerWrapper()
+    return _producer_singleton
@@ -13,21 +13,24 @@ Models included:
 - Linear Regression (baseline)
 """
 
+import asyncio
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple, Optional, Any
 from datetime import datetime, timedelta
 import logging
-import pickle
+import joblib
 import json
 
 # Scikit-learn models
 from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier, GradientBoostingRegressor
-from sklearn.linear_model import LinearRegression, Ridge, Lasso
+from sklearn.ensemble import HistGradientBoostingRegressor, HistGradientBoostingClassifier
+from sklearn.linear_model import Ridge
 from sklearn.tree import DecisionTreeRegressor
-from sklearn.model_selection import cross_val_score, GridSearchCV, TimeSeriesSplit
-from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import cross_val_score, HalvingRandomSearchCV, TimeSeriesSplit
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, classification_report
+from joblib import Parallel, delayed, parallel_config
 
 # Try to import XGBoost (optional)
 try:
@@ -37,6 +40,70 @@ except ImportError:
     XGBOOST_AVAILABLE = False
     logging.warning("XGBoost not available. Install with: pip install xgboost")
 
+# Optional: LightGBM leaf-wise histogram trees
+try:
+    import lightgbm as lgb
+    LIGHTGBM_AVAILABLE = True
+except ImportError:
+    LIGHTGBM_AVAILABLE = False
+
+# Optional: JIT-compiled serving path for TimeSeriesForecaster.forecast
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Optional: RAPIDS cuML GPU random forests (install via the rapids channels);
+# same fit/predict/feature_importances_ contract as the sklearn estimators
+try:
+    from cuml.ensemble import RandomForestRegressor as CuMLRandomForestRegressor
+    from cuml.ensemble import RandomForestClassifier as CuMLRandomForestClassifier
+    CUML_AVAILABLE = True
+except ImportError:
+    CUML_AVAILABLE = False
+
+# Optional: ONNX export + onnxruntime's C++ tree-ensemble inference kernel
+try:
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import FloatTensorType
+    SKL2ONNX_AVAILABLE = True
+except ImportError:
+    SKL2ONNX_AVAILABLE = False
+
+try:
+    import onnxruntime as ort
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ONNXRUNTIME_AVAILABLE = False
+
+
+def _linear_forecast(W: np.ndarray, x: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Dense linear forecast: one matvec against the stored coefficients."""
+    return W @ x + b
+
+
+if njit is not None:
+    _linear_forecast = njit(cache=True, fastmath=True)(_linear_forecast)
+
+
+def _detect_xgb_device() -> str:
+    """Pick the XGBoost device once at import time.
+
+    CUDA builds train the histogram algorithm on GPU; anything else
+    (CPU-only wheel, probe failure) falls back to CPU.
+    """
+    if not XGBOOST_AVAILABLE:
+        return "cpu"
+    try:
+        if xgb.build_info().get("USE_CUDA"):
+            return "cuda"
+    except Exception:
+        pass
+    return "cpu"
+
+
+_XGB_DEVICE = _detect_xgb_device()
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -49,23 +116,56 @@ class AQIPredictionModel:
         Initialize AQI prediction model.
         
         Args:
-            model_type: Type of model ('random_forest', 'xgboost', 'gradient_boosting', 'linear')
+            model_type: Type of model ('random_forest', 'hist_gb', 'lightgbm', 'xgboost', 'gradient_boosting', 'linear')
         """
         self.model_type = model_type
         self.model = None
-        self.feature_importance = None
+        self._feature_names = None
+        self._feature_importance_raw = None
+        self._ort_session = None
         self.training_history = {}
-        
+
         self._initialize_model()
-    
+
     def _initialize_model(self):
         """Initialize the selected model."""
         if self.model_type == 'random_forest':
-            self.model = RandomForestRegressor(
-                n_estimators=100,
-                max_depth=15,
-                min_samples_split=5,
-                min_samples_leaf=2,
+            if CUML_AVAILABLE:
+                # GPU forest: typically 10-30x faster to fit on tabular data
+                self.model = CuMLRandomForestRegressor(
+                    n_estimators=100,
+                    max_depth=15,
+                    n_streams=1,
+                    random_state=42
+                )
+            else:
+                self.model = RandomForestRegressor(
+                    n_estimators=100,
+                    max_depth=15,
+                    min_samples_split=5,
+                    min_samples_leaf=2,
+                    random_state=42,
+                    n_jobs=-1
+                )
+        elif self.model_type == 'hist_gb':
+            # Histogram gradient boosting: features are binned to uint8 once,
+            # so splits evaluate on histograms instead of every sample value -
+            # typically an order of magnitude faster to train than the forest
+            self.model = HistGradientBoostingRegressor(
+                max_iter=300,
+                max_leaf_nodes=63,
+                learning_rate=0.05,
+                early_stopping=True,
+                random_state=42
+            )
+        elif self.model_type == 'lightgbm' and LIGHTGBM_AVAILABLE:
+            # Leaf-wise histogram growth; typically several times faster to
+            # train than the forest at comparable accuracy
+            self.model = lgb.LGBMRegressor(
+                n_estimators=300,
+                num_leaves=63,
+                learning_rate=0.05,
+                feature_fraction=0.8,
                 random_state=42,
                 n_jobs=-1
             )
@@ -75,6 +175,8 @@ class AQIPredictionModel:
                 max_depth=8,
                 learning_rate=0.1,
                 random_state=42,
+                tree_method='hist',
+                device=_XGB_DEVICE,
                 n_jobs=-1
             )
         elif self.model_type == 'gradient_boosting':
@@ -91,6 +193,14 @@ class AQIPredictionModel:
         
         logger.info(f"Initialized {self.model_type} model for AQI prediction")
     
+    @property
+    def feature_importance(self):
+        """Feature importances as a sorted DataFrame (built on demand)."""
+        if self._feature_importance_raw is None:
+            return None
+        names, imps = self._feature_importance_raw
+        return pd.DataFrame({'feature': names, 'importance': imps})
+
     def prepare_features(self, df: pd.DataFrame, target_col: str = 'aqi_value') -> Tuple[pd.DataFrame, pd.Series]:
         """
         Prepare features and target for training.
@@ -108,18 +218,25 @@ class AQIPredictionModel:
             'traffic_level', 'latitude', 'longitude'
         ]
         
-        # Add lag features if available
-        lag_features = [col for col in df.columns if 'lag' in col or 'ma' in col]
-        feature_cols.extend(lag_features)
-        
-        # Filter to only existing columns
-        feature_cols = [col for col in feature_cols if col in df.columns]
-        
-        # Remove rows with NaN in target or features
-        df_clean = df.dropna(subset=[target_col] + feature_cols)
-        
-        X = df_clean[feature_cols]
-        y = df_clean[target_col]
+        # Add lag features if available (one vectorized scan over the column
+        # index instead of two Python substring tests per column), and collapse
+        # the existence filter into a single index intersection
+        lag_mask = df.columns.str.contains(r'lag|ma', na=False)
+        feature_cols = (
+            pd.Index(feature_cols).intersection(df.columns, sort=False).tolist()
+            + df.columns[lag_mask].tolist()
+        )
+
+        # Remove rows with NaN in target or features. A single vectorized
+        # isnan sweep over just the needed columns replaces dropna, which
+        # materialized a full copy of every column before slicing
+        cols = [target_col] + feature_cols
+        mask = ~np.isnan(df[cols].to_numpy(dtype=np.float32)).any(axis=1)
+
+        # Tree learners stream every sample x feature on each split; float32
+        # halves that memory traffic at no accuracy cost for these ranges
+        X = df.loc[mask, feature_cols].astype(np.float32)
+        y = df.loc[mask, target_col]
         
         logger.info(f"Prepared {len(feature_cols)} features with {len(X)} samples")
         return X, y
@@ -143,37 +260,45 @@ class AQIPredictionModel:
         """
         logger.info(f"Training {self.model_type} model...")
         start_time = datetime.now()
-        
+
+        # One explicit contiguous float32 copy reused for fit and predict;
+        # otherwise sklearn's check_array re-copies the frame on every call
+        self._feature_names = list(X_train.columns)
+        Xtr = np.ascontiguousarray(X_train.to_numpy(dtype=np.float32))
+        ytr = np.ascontiguousarray(y_train.to_numpy(dtype=np.float32))
+
         if tune_hyperparameters:
-            self.model = self._tune_hyperparameters(X_train, y_train)
+            self.model = self._tune_hyperparameters(Xtr, ytr)
         else:
-            self.model.fit(X_train, y_train)
-        
+            self.model.fit(Xtr, ytr)
+
         training_time = (datetime.now() - start_time).total_seconds()
-        
-        # Calculate training metrics
-        y_train_pred = self.model.predict(X_train)
-        train_metrics = self._calculate_metrics(y_train, y_train_pred, 'train')
-        
-        # Calculate validation metrics if provided
+
+        # One predict over train+val: the per-call overhead and the ensemble
+        # tree walk are paid once instead of once per split
         val_metrics = {}
         if X_val is not None and y_val is not None:
-            y_val_pred = self.model.predict(X_val)
-            val_metrics = self._calculate_metrics(y_val, y_val_pred, 'validation')
+            Xval = np.ascontiguousarray(X_val.to_numpy(dtype=np.float32))
+            y_all_pred = self.model.predict(np.vstack((Xtr, Xval)))
+            y_train_pred = y_all_pred[:len(Xtr)]
+            val_metrics = self._calculate_metrics(y_val, y_all_pred[len(Xtr):], 'validation')
+        else:
+            y_train_pred = self.model.predict(Xtr)
+        train_metrics = self._calculate_metrics(y_train, y_train_pred, 'train')
         
         # Store feature importance
         if hasattr(self.model, 'feature_importances_'):
-            self.feature_importance = pd.DataFrame({
-                'feature': X_train.columns,
-                'importance': self.model.feature_importances_
-            }).sort_values('importance', ascending=False)
+            # Sorted numpy pair; the DataFrame is built lazily via the property
+            imps = np.asarray(self.model.feature_importances_)
+            order = np.argsort(-imps)
+            self._feature_importance_raw = (np.asarray(self._feature_names)[order], imps[order])
         
         # Store training history
         self.training_history = {
             'model_type': self.model_type,
             'training_time': training_time,
             'train_samples': len(X_train),
-            'features': list(X_train.columns),
+            'features': self._feature_names,
             'train_metrics': train_metrics,
             'val_metrics': val_metrics,
             'timestamp': datetime.now().isoformat()
@@ -185,7 +310,12 @@ class AQIPredictionModel:
         return self.training_history
     
     def _tune_hyperparameters(self, X_train: pd.DataFrame, y_train: pd.Series):
-        """Perform hyperparameter tuning using GridSearchCV."""
+        """Perform hyperparameter tuning using successive halving.
+
+        Most candidate configurations train on small sample subsets and only
+        the survivors see the full data, instead of every grid point being
+        fit to completion as with an exhaustive grid search.
+        """
         logger.info("Tuning hyperparameters...")
         
         if self.model_type == 'random_forest':
@@ -195,46 +325,151 @@ class AQIPredictionModel:
                 'min_samples_split': [2, 5, 10]
             }
         elif self.model_type == 'xgboost' and XGBOOST_AVAILABLE:
-            param_grid = {
-                'n_estimators': [50, 100, 200],
-                'max_depth': [5, 8, 10],
-                'learning_rate': [0.01, 0.1, 0.2]
-            }
+            return self._tune_xgboost(X_train, y_train)
         else:
             logger.warning("Hyperparameter tuning not implemented for this model type")
             return self.model
         
-        grid_search = GridSearchCV(
+        halving_search = HalvingRandomSearchCV(
             self.model,
-            param_grid,
-            cv=3,
+            param_distributions=param_grid,
+            factor=3,
+            resource='n_samples',
+            min_resources='exhaust',
+            cv=TimeSeriesSplit(n_splits=3),
             scoring='neg_mean_squared_error',
             n_jobs=-1,
+            random_state=42,
             verbose=1
         )
-        
-        grid_search.fit(X_train, y_train)
-        logger.info(f"Best parameters: {grid_search.best_params_}")
-        
-        return grid_search.best_estimator_
-    
-    def _calculate_metrics(self, y_true: pd.Series, y_pred: np.ndarray, 
+
+        # Ordered splits respect the time series (no training on the future);
+        # capping inner BLAS threads keeps the loky workers from
+        # oversubscribing the cores with nested thread pools
+        with parallel_config(backend='loky', n_jobs=-1, inner_max_num_threads=1):
+            halving_search.fit(X_train, y_train)
+        logger.info(f"Best parameters: {halving_search.best_params_}")
+
+        return halving_search.best_estimator_
+
+    def _tune_xgboost(self, X_train, y_train):
+        """Tune the XGBoost branch with xgb.cv over one shared QuantileDMatrix.
+
+        A CV search through the sklearn wrapper re-quantizes the features for
+        every (config x fold) pair. Building the QuantileDMatrix once lets
+        xgb.cv reuse the binned data and histogram buffers across every fold
+        of every candidate, and early stopping picks the boosting round count
+        so n_estimators drops out of the grid entirely.
+        """
+        dtrain = xgb.QuantileDMatrix(X_train, y_train)
+        base_params = {
+            'objective': 'reg:squarederror',
+            'tree_method': 'hist',
+            'device': _XGB_DEVICE,
+            'seed': 42
+        }
+
+        best_score = np.inf
+        best_params = {}
+        for max_depth in (5, 8, 10):
+            for learning_rate in (0.01, 0.1, 0.2):
+                params = dict(base_params, max_depth=max_depth, learning_rate=learning_rate)
+                cv_results = xgb.cv(
+                    params, dtrain,
+                    num_boost_round=200,
+                    nfold=3,
+                    metrics='rmse',
+                    early_stopping_rounds=20,
+                    seed=42,
+                    as_pandas=False
+                )
+                rmse = cv_results['test-rmse-mean'][-1]
+                if rmse < best_score:
+                    best_score = rmse
+                    best_params = {
+                        'max_depth': max_depth,
+                        'learning_rate': learning_rate,
+                        'n_estimators': len(cv_results['test-rmse-mean'])
+                    }
+
+        logger.info(f"Best parameters: {best_params} (cv rmse {best_score:.3f})")
+
+        # Refit through the sklearn wrapper so predict/save keep their contract
+        self.model.set_params(**best_params)
+        self.model.fit(X_train, y_train)
+        return self.model
+
+    def _calculate_metrics(self, y_true: pd.Series, y_pred: np.ndarray,
                           prefix: str = '') -> Dict[str, float]:
-        """Calculate regression metrics."""
+        """Calculate regression metrics in one pass over the residuals.
+
+        The four sklearn helpers each re-materialized the residual array;
+        computing everything from a single float32 residual vector does one
+        pass over a third of the memory.
+        """
+        yt = np.asarray(y_true, dtype=np.float32)
+        yp = np.asarray(y_pred, dtype=np.float32)
+        r = yt - yp
+        sse = float(np.dot(r, r))
+        centered = yt - yt.mean()
+        ss_tot = float(np.dot(centered, centered))
         metrics = {
-            f'{prefix}_rmse': np.sqrt(mean_squared_error(y_true, y_pred)),
-            f'{prefix}_mae': mean_absolute_error(y_true, y_pred),
-            f'{prefix}_r2': r2_score(y_true, y_pred),
-            f'{prefix}_mape': np.mean(np.abs((y_true - y_pred) / y_true)) * 100
+            f'{prefix}_rmse': float(np.sqrt(sse / len(yt))),
+            f'{prefix}_mae': float(np.abs(r).mean()),
+            f'{prefix}_r2': 1.0 - sse / ss_tot if ss_tot else 0.0,
+            f'{prefix}_mape': float(np.abs(r / np.where(yt == 0, 1, yt)).mean() * 100)
         }
         return metrics
     
     def predict(self, X: pd.DataFrame) -> np.ndarray:
-        """Make predictions."""
+        """Make predictions.
+
+        Prefers the onnxruntime session when one is loaded: its tree-ensemble
+        kernel evaluates all trees in a single SIMD pass, typically several
+        times faster than sklearn predict at serving batch sizes.
+        """
+        if self._ort_session is not None:
+            X = np.ascontiguousarray(np.asarray(X, dtype=np.float32))
+            input_name = self._ort_session.get_inputs()[0].name
+            return self._ort_session.run(None, {input_name: X})[0].ravel()
         if self.model is None:
             raise ValueError("Model not trained yet")
         return self.model.predict(X)
-    
+
+    def save_onnx(self, filepath: str):
+        """Export the trained model to ONNX for onnxruntime serving.
+
+        Requires skl2onnx; the artifact is runtime-portable and drops the
+        per-tree Python dispatch that the pickled ensemble pays at predict.
+        """
+        if self.model is None:
+            raise ValueError("Model not trained yet")
+        if not SKL2ONNX_AVAILABLE:
+            raise ImportError("skl2onnx not available. Install with: pip install skl2onnx")
+
+        n_features = len(self._feature_names) if self._feature_names else None
+        onnx_model = convert_sklearn(
+            self.model,
+            initial_types=[('input', FloatTensorType([None, n_features]))]
+        )
+        with open(filepath, 'wb') as f:
+            f.write(onnx_model.SerializeToString())
+        logger.info(f"ONNX model saved to {filepath}")
+
+    def load_onnx(self, filepath: str):
+        """Load an ONNX artifact; predict() then serves through onnxruntime.
+
+        Falls back silently to the sklearn model when onnxruntime is not
+        installed, so callers can attempt the fast path unconditionally.
+        """
+        if not ONNXRUNTIME_AVAILABLE:
+            logger.warning("onnxruntime not available; predict() stays on sklearn")
+            return
+        self._ort_session = ort.InferenceSession(
+            filepath, providers=['CPUExecutionProvider']
+        )
+        logger.info(f"ONNX model loaded from {filepath}")
+
     def evaluate(self, X_test: pd.DataFrame, y_test: pd.Series) -> Dict[str, Any]:
         """
         Evaluate model on test set.
@@ -260,28 +495,41 @@ class AQIPredictionModel:
         
         return metrics
     
-    def save_model(self, filepath: str):
-        """Save model to file."""
+    def save_model(self, filepath: str, compress: bool = True):
+        """Save model to file.
+
+        compress=False writes an uncompressed artifact that load_model can
+        memory-map, trading disk for cold-start latency.
+        """
         model_data = {
             'model': self.model,
             'model_type': self.model_type,
-            'feature_importance': self.feature_importance,
+            'feature_importance': self._feature_importance_raw,
             'training_history': self.training_history
         }
         
-        with open(filepath, 'wb') as f:
-            pickle.dump(model_data, f)
-        
+        # joblib uses pickle protocol 5 with out-of-band numpy buffers;
+        # lz4 keeps tree ensembles several times smaller at high throughput
+        if compress:
+            joblib.dump(model_data, filepath, compress=('lz4', 3), protocol=5)
+        else:
+            joblib.dump(model_data, filepath, protocol=5)
+
         logger.info(f"Model saved to {filepath}")
     
     def load_model(self, filepath: str):
         """Load model from file."""
-        with open(filepath, 'rb') as f:
-            model_data = pickle.load(f)
-        
+        # Uncompressed artifacts are memory-mapped: the first predict warms
+        # only the pages it touches instead of materializing every tree.
+        # joblib ignores mmap_mode for compressed files and loads normally.
+        model_data = joblib.load(filepath, mmap_mode='r')
+
         self.model = model_data['model']
         self.model_type = model_data['model_type']
-        self.feature_importance = model_data.get('feature_importance')
+        fi = model_data.get('feature_importance')
+        if isinstance(fi, pd.DataFrame):  # artifacts saved in the old format
+            fi = (fi['feature'].to_numpy(), fi['importance'].to_numpy())
+        self._feature_importance_raw = fi
         self.training_history = model_data.get('training_history', {})
         
         logger.info(f"Model loaded from {filepath}")
@@ -295,11 +543,12 @@ class TrafficPredictionModel:
         Initialize traffic prediction model.
         
         Args:
-            model_type: Type of model ('random_forest', 'xgboost', 'gradient_boosting')
+            model_type: Type of model ('random_forest', 'hist_gb', 'lightgbm', 'xgboost')
         """
         self.model_type = model_type
         self.model = None
-        self.feature_importance = None
+        self._feature_names = None
+        self._feature_importance_raw = None
         self.training_history = {}
         
         self._initialize_model()
@@ -307,10 +556,38 @@ class TrafficPredictionModel:
     def _initialize_model(self):
         """Initialize the selected model."""
         if self.model_type == 'random_forest':
-            self.model = RandomForestClassifier(
-                n_estimators=100,
-                max_depth=15,
-                min_samples_split=5,
+            if CUML_AVAILABLE:
+                # GPU forest, mirroring the AQI regressor branch
+                self.model = CuMLRandomForestClassifier(
+                    n_estimators=100,
+                    max_depth=15,
+                    n_streams=1,
+                    random_state=42
+                )
+            else:
+                self.model = RandomForestClassifier(
+                    n_estimators=100,
+                    max_depth=15,
+                    min_samples_split=5,
+                    random_state=42,
+                    n_jobs=-1
+                )
+        elif self.model_type == 'hist_gb':
+            # Same histogram-binned algorithm as the regressor above
+            self.model = HistGradientBoostingClassifier(
+                max_iter=300,
+                max_leaf_nodes=63,
+                learning_rate=0.05,
+                early_stopping=True,
+                random_state=42
+            )
+        elif self.model_type == 'lightgbm' and LIGHTGBM_AVAILABLE:
+            # Same leaf-wise histogram learner as the AQI regressor
+            self.model = lgb.LGBMClassifier(
+                n_estimators=300,
+                num_leaves=63,
+                learning_rate=0.05,
+                feature_fraction=0.8,
                 random_state=42,
                 n_jobs=-1
             )
@@ -320,6 +597,8 @@ class TrafficPredictionModel:
                 max_depth=8,
                 learning_rate=0.1,
                 random_state=42,
+                tree_method='hist',
+                device=_XGB_DEVICE,
                 n_jobs=-1
             )
         else:
@@ -327,6 +606,14 @@ class TrafficPredictionModel:
         
         logger.info(f"Initialized {self.model_type} model for traffic prediction")
     
+    @property
+    def feature_importance(self):
+        """Feature importances as a sorted DataFrame (built on demand)."""
+        if self._feature_importance_raw is None:
+            return None
+        names, imps = self._feature_importance_raw
+        return pd.DataFrame({'feature': names, 'importance': imps})
+
     def prepare_features(self, df: pd.DataFrame, target_col: str = 'traffic_level') -> Tuple[pd.DataFrame, pd.Series]:
         """Prepare features and target for training."""
         feature_cols = [
@@ -334,18 +621,21 @@ class TrafficPredictionModel:
             'aqi_value', 'latitude', 'longitude'
         ]
         
-        # Add lag features if available
-        lag_features = [col for col in df.columns if 'lag' in col or 'ma' in col]
-        feature_cols.extend(lag_features)
-        
-        # Filter to only existing columns
-        feature_cols = [col for col in feature_cols if col in df.columns]
-        
-        # Remove rows with NaN
-        df_clean = df.dropna(subset=[target_col] + feature_cols)
-        
-        X = df_clean[feature_cols]
-        y = df_clean[target_col]
+        # Add lag features if available (vectorized scan, see AQI model)
+        lag_mask = df.columns.str.contains(r'lag|ma', na=False)
+        feature_cols = (
+            pd.Index(feature_cols).intersection(df.columns, sort=False).tolist()
+            + df.columns[lag_mask].tolist()
+        )
+
+        # Remove rows with NaN via one isnan sweep over just the needed
+        # columns instead of dropna's full-frame copy (see AQI model)
+        cols = [target_col] + feature_cols
+        mask = ~np.isnan(df[cols].to_numpy(dtype=np.float32)).any(axis=1)
+
+        # float32 features halve split-scan memory traffic (see AQI model)
+        X = df.loc[mask, feature_cols].astype(np.float32)
+        y = df.loc[mask, target_col]
         
         logger.info(f"Prepared {len(feature_cols)} features with {len(X)} samples")
         return X, y
@@ -356,21 +646,28 @@ class TrafficPredictionModel:
         """Train the classification model."""
         logger.info(f"Training {self.model_type} classifier...")
         start_time = datetime.now()
-        
-        self.model.fit(X_train, y_train)
+
+        # Single contiguous float32 copy, reused below (see AQI model)
+        self._feature_names = list(X_train.columns)
+        Xtr = np.ascontiguousarray(X_train.to_numpy(dtype=np.float32))
+        ytr = y_train.to_numpy()
+
+        self.model.fit(Xtr, ytr)
         training_time = (datetime.now() - start_time).total_seconds()
-        
+
         # Calculate training metrics
-        y_train_pred = self.model.predict(X_train)
+        y_train_pred = self.model.predict(Xtr)
         train_metrics = {
             'train_accuracy': accuracy_score(y_train, y_train_pred),
             'train_f1': f1_score(y_train, y_train_pred, average='weighted')
         }
-        
+
         # Validation metrics
         val_metrics = {}
         if X_val is not None and y_val is not None:
-            y_val_pred = self.model.predict(X_val)
+            y_val_pred = self.model.predict(
+                np.ascontiguousarray(X_val.to_numpy(dtype=np.float32))
+            )
             val_metrics = {
                 'val_accuracy': accuracy_score(y_val, y_val_pred),
                 'val_f1': f1_score(y_val, y_val_pred, average='weighted')
@@ -378,16 +675,16 @@ class TrafficPredictionModel:
         
         # Feature importance
         if hasattr(self.model, 'feature_importances_'):
-            self.feature_importance = pd.DataFrame({
-                'feature': X_train.columns,
-                'importance': self.model.feature_importances_
-            }).sort_values('importance', ascending=False)
+            # Sorted numpy pair; the DataFrame is built lazily via the property
+            imps = np.asarray(self.model.feature_importances_)
+            order = np.argsort(-imps)
+            self._feature_importance_raw = (np.asarray(self._feature_names)[order], imps[order])
         
         self.training_history = {
             'model_type': self.model_type,
             'training_time': training_time,
             'train_samples': len(X_train),
-            'features': list(X_train.columns),
+            'features': self._feature_names,
             'train_metrics': train_metrics,
             'val_metrics': val_metrics,
             'timestamp': datetime.now().isoformat()
@@ -426,33 +723,133 @@ class TrafficPredictionModel:
         
         return metrics
     
-    def save_model(self, filepath: str):
-        """Save model to file."""
+    def save_model(self, filepath: str, compress: bool = True):
+        """Save model to file.
+
+        compress=False writes an uncompressed artifact that load_model can
+        memory-map, trading disk for cold-start latency.
+        """
         model_data = {
             'model': self.model,
             'model_type': self.model_type,
-            'feature_importance': self.feature_importance,
+            'feature_importance': self._feature_importance_raw,
             'training_history': self.training_history
         }
         
-        with open(filepath, 'wb') as f:
-            pickle.dump(model_data, f)
-        
+        # joblib uses pickle protocol 5 with out-of-band numpy buffers;
+        # lz4 keeps tree ensembles several times smaller at high throughput
+        if compress:
+            joblib.dump(model_data, filepath, compress=('lz4', 3), protocol=5)
+        else:
+            joblib.dump(model_data, filepath, protocol=5)
+
         logger.info(f"Model saved to {filepath}")
     
     def load_model(self, filepath: str):
         """Load model from file."""
-        with open(filepath, 'rb') as f:
-            model_data = pickle.load(f)
-        
+        # Uncompressed artifacts are memory-mapped: the first predict warms
+        # only the pages it touches instead of materializing every tree.
+        # joblib ignores mmap_mode for compressed files and loads normally.
+        model_data = joblib.load(filepath, mmap_mode='r')
+
         self.model = model_data['model']
         self.model_type = model_data['model_type']
-        self.feature_importance = model_data.get('feature_importance')
+        fi = model_data.get('feature_importance')
+        if isinstance(fi, pd.DataFrame):  # artifacts saved in the old format
+            fi = (fi['feature'].to_numpy(), fi['importance'].to_numpy())
+        self._feature_importance_raw = fi
         self.training_history = model_data.get('training_history', {})
         
         logger.info(f"Model loaded from {filepath}")
 
 
+class BatchedPredictor:
+    """Coalesce concurrent predict_proba calls into one batched model call.
+
+    A tree-ensemble predict_proba pays a near-constant overhead (estimator
+    dispatch plus a full tree walk) regardless of batch size, so serving
+    single-row requests one at a time wastes most of it. Requests arriving
+    within max_wait_ms are stacked into one matrix, scored with a single
+    model call, and the probability rows are sliced back to each awaiting
+    caller. Wraps anything with a predict_proba, e.g. a trained
+    TrafficPredictionModel.
+    """
+
+    def __init__(self, model, max_wait_ms: float = 20, max_batch_size: int = 256):
+        self.model = model
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task = None
+
+    async def predict_proba(self, X) -> np.ndarray:
+        """Queue rows for the next batch and await their probabilities."""
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run())
+        future = loop.create_future()
+        rows = np.atleast_2d(np.asarray(X, dtype=np.float32))
+        await self._queue.put((rows, future))
+        return await future
+
+    async def stop(self):
+        """Cancel the background batching task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self._queue.get()]
+            # Hold the batch open briefly so concurrent requests pile in
+            deadline = loop.time() + self.max_wait
+            while len(pending) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    pending.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            X = np.vstack([rows for rows, _ in pending])
+            try:
+                # predict_proba releases the GIL inside the tree kernels, so
+                # the executor thread scores without stalling the event loop
+                proba = await loop.run_in_executor(None, self.model.predict_proba, X)
+            except Exception as exc:
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+
+            offset = 0
+            for rows, future in pending:
+                if not future.done():
+                    future.set_result(proba[offset:offset + len(rows)])
+                offset += len(rows)
+
+
+def _fit_location_model(X: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Fit one per-location linear forecaster (runs on the parallel pool).
+
+    Closed-form least squares: one LAPACK solve covers every
+    forecast-horizon column at once, instead of sklearn's per-estimator
+    validation and solver setup.
+
+    Returns:
+        Tuple of (W, b) with W shaped [horizon, lookback]
+    """
+    A = np.hstack([X, np.ones((len(X), 1))])
+    coef, *_ = np.linalg.lstsq(A, y, rcond=None)
+    return coef[:-1].T, coef[-1]
+
+
 class TimeSeriesForecaster:
     """Time series forecasting for AQI and traffic."""
     
@@ -464,7 +861,13 @@ class TimeSeriesForecaster:
             forecast_horizon: Number of hours to forecast ahead
         """
         self.forecast_horizon = forecast_horizon
-        self.models = {}  # One model per location
+        # One (weights, intercept) pair per location; forecast() serves
+        # directly from these dense coefficients
+        self.weights = {}
+        self.intercepts = {}
+        # Most recent observations per location so forecast() can skip the
+        # per-request mask + sort entirely
+        self._last_values = {}
         
     def prepare_sequences(self, df: pd.DataFrame, 
                          target_col: str,
@@ -480,50 +883,84 @@ class TimeSeriesForecaster:
         Returns:
             Tuple of (X, y) arrays
         """
-        data = df[target_col].values
-        X, y = [], []
-        
-        for i in range(lookback, len(data) - self.forecast_horizon):
-            X.append(data[i-lookback:i])
-            y.append(data[i:i+self.forecast_horizon])
-        
-        return np.array(X), np.array(y)
+        data = np.ascontiguousarray(df[target_col].to_numpy())
+        window = lookback + self.forecast_horizon
+        if len(data) < window:
+            return np.empty((0, lookback)), np.empty((0, self.forecast_horizon))
+
+        # Zero-copy windows over the series: each row is a view shifted by one
+        # step, so no per-step list append or array materialization happens.
+        # Trim one row to match the original loop's exclusive upper bound.
+        w = np.lib.stride_tricks.sliding_window_view(data, window)[:-1]
+        return w[:, :lookback], w[:, lookback:]
     
     def train_per_location(self, df: pd.DataFrame, target_col: str = 'aqi_value'):
         """Train separate models for each location."""
         logger.info(f"Training time series models for {target_col}...")
-        
-        for location in df['location'].unique():
-            df_loc = df[df['location'] == location].sort_values('timestamp')
-            
-            X, y = self.prepare_sequences(df_loc, target_col)
-            
+
+        # One sort over the whole frame; groupby then yields contiguous
+        # slices instead of a boolean mask scan + re-sort per location
+        df_sorted = df.sort_values(['location', 'timestamp'])
+
+        locations, jobs = [], []
+        for location, grp in df_sorted.groupby('location', sort=False):
+            X, y = self.prepare_sequences(grp, target_col)
             if len(X) > 0:
-                # Use simple linear model for each location
-                model = LinearRegression()
-                model.fit(X, y)
-                self.models[location] = model
-                
+                locations.append(location)
+                jobs.append(delayed(_fit_location_model)(X, y))
+                # Seed the serving buffer with the freshest observations
+                self._last_values[location] = np.ascontiguousarray(
+                    grp[target_col].to_numpy(dtype=np.float64)[-24:]
+                )
+
+        if jobs:
+            # Per-location fits are independent; spread them over all cores
+            fitted = Parallel(n_jobs=-1, backend='loky')(jobs)
+            for location, (W, b) in zip(locations, fitted):
+                # Contiguous copies so forecast() is a plain matvec with no
+                # sklearn predict overhead per request
+                self.weights[location] = np.ascontiguousarray(W, dtype=np.float64)
+                self.intercepts[location] = np.ascontiguousarray(
+                    np.atleast_1d(b), dtype=np.float64
+                )
                 logger.info(f"Trained model for {location}")
     
-    def forecast(self, df: pd.DataFrame, location: str, 
+    def update(self, location: str, new_value: float):
+        """Roll one newly ingested value into a location's serving buffer."""
+        buf = self._last_values.get(location)
+        if buf is not None:
+            buf[:-1] = buf[1:]
+            buf[-1] = new_value
+
+    def forecast(self, df: Optional[pd.DataFrame], location: str,
                 target_col: str = 'aqi_value',
                 lookback: int = 24) -> np.ndarray:
-        """Make forecast for a specific location."""
-        if location not in self.models:
+        """Make forecast for a specific location.
+
+        With df=None the forecast is served from the cached per-location
+        buffer (seeded at training time, rolled via update()), skipping the
+        per-request mask and sort entirely.
+        """
+        if location not in self.weights:
             raise ValueError(f"No model trained for location: {location}")
-        
-        # Get last lookback values
-        df_loc = df[df['location'] == location].sort_values('timestamp')
-        last_values = df_loc[target_col].tail(lookback).values
-        
-        if len(last_values) < lookback:
-            raise ValueError(f"Not enough data for forecast (need {lookback} points)")
-        
-        X = last_values.reshape(1, -1)
-        forecast = self.models[location].predict(X)
-        
-        return forecast[0]
+
+        if df is not None:
+            # Get last lookback values and refresh the serving buffer
+            df_loc = df[df['location'] == location].sort_values('timestamp')
+            last_values = df_loc[target_col].tail(lookback).to_numpy()
+            if len(last_values) < lookback:
+                raise ValueError(f"Not enough data for forecast (need {lookback} points)")
+            x = np.ascontiguousarray(last_values, dtype=np.float64)
+            self._last_values[location] = x
+        else:
+            x = self._last_values.get(location)
+            if x is None or len(x) < lookback:
+                raise ValueError(f"Not enough cached data for forecast (need {lookback} points)")
+            x = x[-lookback:]
+
+        # Serve from the stored coefficients: a single (JIT-compiled when
+        # numba is installed) matvec instead of a sklearn predict call
+        return _linear_forecast(self.weights[location], x, self.intercepts[location])
 
 
 def main():
@@ -5,6 +5,39 @@ import logging
 from sqlalchemy import text
 
 
+# Explicit dtypes for the serving-layer reads: pandas skips its per-column
+# type sniffing, and float32 halves the coordinate/measure footprint (the
+# measures stay float so SQL NULLs survive as NaN)
+_READ_DTYPES = {
+    'latitude': 'float32',
+    'longitude': 'float32',
+    'aqi_value': 'float32',
+    'traffic_level': 'float32'
+}
+
+# Optional: Arrow-native Postgres transport
+try:
+    import connectorx as cx
+except ImportError:
+    cx = None
+
+
+def _read_sql_fast(engine, query: str, dtype=None) -> pd.DataFrame:
+    """Read a query via connectorx when installed, pd.read_sql otherwise.
+
+    connectorx streams the Postgres binary protocol straight into Arrow and
+    zero-copies into pandas, skipping the per-row Python object conversion
+    of the SQLAlchemy path.
+    """
+    if cx is not None:
+        try:
+            dsn = engine.url.render_as_string(hide_password=False)
+            return cx.read_sql(dsn, query, return_type='pandas')
+        except Exception as e:
+            logging.warning(f"connectorx read failed, using pd.read_sql: {e}")
+    return pd.read_sql(query, engine, dtype=dtype)
+
+
 class ServingLayer:
     """Serving layer that combines Batch Layer and Speed Layer data."""
     
@@ -18,25 +51,70 @@ class ServingLayer:
         self.db_connection = db_connection
         # Time threshold: use speed layer for data newer than this
         self.realtime_threshold_minutes = 60  # Last 1 hour
-    
+        # Engine cached across queries; fetching it per read risked
+        # rebuilding connection pools on a hot serving path
+        self._engine = None
+
+        # Statements compiled once with named binds: repeat serving calls
+        # skip re-parsing the SQL string and let the driver reuse server-side
+        # prepared statements
+        self._realtime_stmt = text("""
+            SELECT timestamp, location, latitude, longitude, aqi_value, traffic_level
+            FROM realtime_data
+            WHERE timestamp >= :cutoff AND is_active = TRUE
+            ORDER BY timestamp DESC
+        """)
+        self._latest_peak_stmt = text("""
+            SELECT
+                peak_aqi_hour,
+                peak_aqi_value,
+                peak_aqi_location,
+                peak_traffic_hour,
+                peak_traffic_value,
+                peak_traffic_location,
+                analysis_date
+            FROM peak_hours
+            ORDER BY analysis_date DESC
+            LIMIT 1
+        """)
+        self._peak_hours_stmt = text("""
+            SELECT
+                hour,
+                AVG(avg_traffic_level) as avg_traffic,
+                AVG(avg_aqi_value) as avg_aqi,
+                MAX(CASE WHEN is_peak_hour THEN 1 ELSE 0 END) as is_peak,
+                SUM(total_records) as total_records
+            FROM peak_hours_analysis
+            WHERE date >= :cutoff
+            GROUP BY hour
+            ORDER BY hour
+        """)
+
+    def _get_engine(self):
+        """Return the cached SQLAlchemy engine, fetching it on first use."""
+        if self._engine is None:
+            self._engine = self.db_connection.get_engine()
+        return self._engine
+
     def get_combined_heatmap_data(self) -> Tuple[pd.DataFrame, Any]:
         """
         Get combined data from Speed Layer (recent) and Batch Layer (historical).
-        
+
         Returns:
             Tuple of (DataFrame, last_update_timestamp)
         """
+        # Hot path: the speed layer almost always has enough recent rows, so
+        # the common case is one query and an early return
+        df_realtime = self._get_realtime_data()
+        if len(df_realtime) >= 10:
+            logging.info(f"📡 Serving Layer: Using Speed Layer data ({len(df_realtime)} records)")
+            return df_realtime, df_realtime['timestamp'].max()
+
+        return self._slow_path_combined(df_realtime)
+
+    def _slow_path_combined(self, df_realtime: pd.DataFrame) -> Tuple[pd.DataFrame, Any]:
+        """Cold path: supplement sparse speed-layer data with the batch layer."""
         try:
-            # Get recent data from Speed Layer (realtime_data)
-            df_realtime = self._get_realtime_data()
-            
-            # If we have enough recent data, use it
-            if not df_realtime.empty and len(df_realtime) >= 10:
-                last_update = df_realtime['timestamp'].max()
-                logging.info(f"📡 Serving Layer: Using Speed Layer data ({len(df_realtime)} records)")
-                return df_realtime, last_update
-            
-            # Otherwise, supplement with batch layer data
             df_batch = self._get_batch_data()
             
             if df_batch.empty and df_realtime.empty:
@@ -65,20 +143,14 @@ class ServingLayer:
     def _get_realtime_data(self) -> pd.DataFrame:
         """Get recent data from Speed Layer (realtime_data table)."""
         try:
-            engine = self.db_connection.get_engine()
+            engine = self._get_engine()
             if not engine:
                 return pd.DataFrame()
             
             cutoff_time = datetime.now() - timedelta(minutes=self.realtime_threshold_minutes)
-            
-            query = """
-            SELECT timestamp, location, latitude, longitude, aqi_value, traffic_level
-            FROM realtime_data
-            WHERE timestamp >= %s AND is_active = TRUE
-            ORDER BY timestamp DESC
-            """
-            
-            df = pd.read_sql(query, engine, params=(cutoff_time,))
+
+            df = pd.read_sql(self._realtime_stmt, engine,
+                             params={'cutoff': cutoff_time}, dtype=_READ_DTYPES)
             
             if not df.empty:
                 # Add normalized AQI column
@@ -93,79 +165,69 @@ class ServingLayer:
     def _get_batch_data(self) -> pd.DataFrame:
         """Get aggregated data from Batch Layer (batch_aggregations table)."""
         try:
-            engine = self.db_connection.get_engine()
+            engine = self._get_engine()
             if not engine:
                 return pd.DataFrame()
             
             # Get latest hourly aggregations (last 24 hours)
             cutoff_date = (datetime.now() - timedelta(days=1)).date()
             
-            query = """
-            SELECT 
-                CAST(date AS TIMESTAMP) + INTERVAL '1 hour' * COALESCE(hour, 12) as timestamp,
-                location,
-                AVG(latitude) as latitude,  -- Assuming we'll join with location data
-                AVG(longitude) as longitude,
-                CAST(avg_aqi AS INTEGER) as aqi_value,
-                CAST(avg_traffic AS INTEGER) as traffic_level
-            FROM batch_aggregations ba
-            WHERE date >= %s AND hour IS NOT NULL
-            GROUP BY date, hour, location
-            ORDER BY timestamp DESC
+            # The cutoff is generated above, so inlining it keeps the query a
+            # plain string both transports can run. The LATERAL join pulls
+            # each location's latest coordinates from raw_data in the same
+            # round trip (batch_aggregations has none), replacing the second
+            # query + pandas merge this method used to do
+            query = f"""
+            SELECT
+                ba.timestamp,
+                ba.location,
+                COALESCE(coords.latitude, ba.latitude) AS latitude,
+                COALESCE(coords.longitude, ba.longitude) AS longitude,
+                ba.aqi_value,
+                ba.traffic_level
+            FROM (
+                SELECT
+                    CAST(date AS TIMESTAMP) + INTERVAL '1 hour' * COALESCE(hour, 12) as timestamp,
+                    location,
+                    AVG(latitude) as latitude,
+                    AVG(longitude) as longitude,
+                    CAST(avg_aqi AS INTEGER) as aqi_value,
+                    CAST(avg_traffic AS INTEGER) as traffic_level
+                FROM batch_aggregations
+                WHERE date >= '{cutoff_date}' AND hour IS NOT NULL
+                GROUP BY date, hour, location
+            ) ba
+            LEFT JOIN LATERAL (
+                SELECT latitude, longitude
+                FROM raw_data r
+                WHERE r.location = ba.location
+                ORDER BY r.timestamp DESC
+                LIMIT 1
+            ) coords ON TRUE
+            ORDER BY ba.timestamp DESC
             LIMIT 100
             """
-            
-            df = pd.read_sql(query, engine, params=(cutoff_date,))
-            
+
+            df = _read_sql_fast(engine, query, dtype=_READ_DTYPES)
+
             if not df.empty:
-                # Get location coordinates (since batch_aggregations doesn't have them)
-                df = self._enrich_with_coordinates(df)
                 df['aqi_clean'] = df['aqi_value'].fillna(0).astype(int)
-            
+
             return df
-            
+
         except Exception as e:
             logging.error(f"Error getting batch data: {e}")
             return pd.DataFrame()
     
-    def _enrich_with_coordinates(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Enrich batch data with latitude/longitude from raw_data."""
-        try:
-            engine = self.db_connection.get_engine()
-            if not engine:
-                return df
-            
-            # Get latest coordinates for each location
-            query = """
-            SELECT DISTINCT ON (location) 
-                location, latitude, longitude
-            FROM raw_data
-            ORDER BY location, timestamp DESC
-            """
-            
-            df_coords = pd.read_sql(query, engine)
-            
-            # Merge coordinates
-            df = df.merge(df_coords, on='location', how='left', suffixes=('', '_new'))
-            df['latitude'] = df['latitude_new'].fillna(df['latitude'])
-            df['longitude'] = df['longitude_new'].fillna(df['longitude'])
-            df = df.drop(columns=['latitude_new', 'longitude_new'], errors='ignore')
-            
-            return df
-            
-        except Exception as e:
-            logging.error(f"Error enriching with coordinates: {e}")
-            return df
-    
     def _get_raw_data_fallback(self) -> Tuple[pd.DataFrame, Any]:
         """Fallback to raw_data if serving layers are not available."""
         try:
-            engine = self.db_connection.get_engine()
+            engine = self._get_engine()
             if not engine:
                 return pd.DataFrame(), "No Data"
             
             query = "SELECT * FROM raw_data ORDER BY timestamp DESC LIMIT 100"
-            df = pd.read_sql(query, engine)
+            df = pd.read_sql(query, engine, dtype=_READ_DTYPES)
             
             if not df.empty:
                 df['aqi_clean'] = df['aqi_value'].fillna(0).astype(int)
@@ -187,22 +249,8 @@ class ServingLayer:
             if not conn:
                 return {}
             
-            # Get latest peak hours analysis
-            query = text("""
-            SELECT 
-                peak_aqi_hour,
-                peak_aqi_value,
-                peak_aqi_location,
-                peak_traffic_hour,
-                peak_traffic_value,
-                peak_traffic_location,
-                analysis_date
-            FROM peak_hours
-            ORDER BY analysis_date DESC
-            LIMIT 1
-            """)
-            
-            result = conn.execute(query)
+            # Get latest peak hours analysis (statement compiled in __init__)
+            result = conn.execute(self._latest_peak_stmt)
             row = result.fetchone()
             
             if row:
@@ -238,27 +286,15 @@ class ServingLayer:
             DataFrame with hourly aggregations including is_peak_hour indicator
         """
         try:
-            engine = self.db_connection.get_engine()
+            engine = self._get_engine()
             if not engine:
                 return pd.DataFrame()
             
             cutoff_date = (datetime.now() - timedelta(days=days)).date()
-            
-            # Get hourly aggregated data with peak hour indicators
-            query = """
-            SELECT 
-                hour,
-                AVG(avg_traffic_level) as avg_traffic,
-                AVG(avg_aqi_value) as avg_aqi,
-                MAX(CASE WHEN is_peak_hour THEN 1 ELSE 0 END) as is_peak,
-                SUM(total_records) as total_records
-            FROM peak_hours_analysis
-            WHERE date >= %s
-            GROUP BY hour
-            ORDER BY hour
-            """
-            
-            df = pd.read_sql(query, engine, params=(cutoff_date,))
+
+            # Hourly aggregated data with peak hour indicators (statement
+            # compiled in __init__)
+            df = pd.read_sql(self._peak_hours_stmt, engine, params={'cutoff': cutoff_date})
             
             if not df.empty:
                 # Ensure data types
@@ -1,7 +1,48 @@
 from typing import Dict, Any
-from datetime import datetime, timedelta
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone
+import csv
+import io
 import logging
+import queue
+import threading
+import time
 from sqlalchemy import text
+from psycopg2.extras import execute_values
+
+
+# AQI category names and the upper bound of each category (last is open-ended)
+_AQI_CATEGORY_NAMES = (
+    "Good",
+    "Moderate",
+    "Unhealthy for Sensitive Groups",
+    "Unhealthy",
+    "Very Unhealthy",
+    "Hazardous",
+)
+_AQI_THRESHOLDS = (50, 100, 150, 200, 300)
+
+# Precomputed 501-entry AQI -> category-id table: categorizing a message is
+# one clamped array load instead of a five-way compare chain. The batch
+# counterpart for whole arrays is fast_ops.aqi_category_codes.
+_CATEGORY_LUT = bytes(bisect_left(_AQI_THRESHOLDS, v) for v in range(501))
+
+
+# Flushes stream the batch through COPY (same pattern as preprocessing's
+# _psql_insert_copy): no per-row parse/plan on the server, one round trip
+_REALTIME_COPY_SQL = (
+    "COPY realtime_data "
+    "(timestamp, location, latitude, longitude, aqi_value, aqi_category, "
+    "traffic_level, is_peak_hour, is_active) FROM STDIN WITH CSV"
+)
+
+# Multi-row INSERT fallback for drivers without copy_expert; execute_values
+# expands the VALUES %s placeholder into the whole pending batch
+_REALTIME_INSERT_SQL = (
+    "INSERT INTO realtime_data "
+    "(timestamp, location, latitude, longitude, aqi_value, aqi_category, "
+    "traffic_level, is_peak_hour, is_active) VALUES %s"
+)
 
 
 class StreamProcessor:
@@ -10,17 +51,103 @@ class StreamProcessor:
     # Peak hours definition (Jakarta rush hours)
     MORNING_PEAK = (6, 10)  # 6 AM - 10 AM
     EVENING_PEAK = (16, 20)  # 4 PM - 8 PM
-    
-    def __init__(self, db_connection):
+
+    # 24-bit mask with bit h set when hour h is a peak hour; checking a
+    # message is then one shift+and instead of four comparisons
+    PEAK_MASK = 0
+    for _h in range(*MORNING_PEAK):
+        PEAK_MASK |= 1 << _h
+    for _h in range(*EVENING_PEAK):
+        PEAK_MASK |= 1 << _h
+    del _h
+
+    def __init__(self, db_connection, batch_size: int = 500, batch_timeout: float = 0.2):
         """
         Initialize stream processor.
-        
+
         Args:
             db_connection: DatabaseConnection instance
+            batch_size: Flush the write buffer at this many queued rows
+            batch_timeout: Flush when the oldest queued row is this old (seconds)
         """
         self.db_connection = db_connection
         # Window size for real-time aggregation (in minutes)
         self.window_size_minutes = 5
+
+        # Speed-layer write batching: rows accumulate here and are flushed
+        # in one execute_values round trip when the batch fills up or the
+        # oldest queued row exceeds the timeout (see _insert_realtime_data)
+        self._pending = []
+        self._flush_threshold = batch_size
+        self._batch_timeout = batch_timeout
+        self._first_pending_at = None
+
+        # Completed batches are written on a dedicated thread (started
+        # lazily) so the consumer keeps draining Kafka while a COPY round
+        # trip is in flight — same handoff pattern as the ingestion
+        # service's sender thread
+        self._write_queue = queue.Queue(maxsize=8)
+        self._writer = None
+
+        # Old-row cleanup is throttled to this interval (seconds); the
+        # scan-for-update UPDATE is housekeeping, not per-batch work
+        self._cleanup_interval = 300.0
+        self._last_cleanup_at = time.monotonic()
+
+        # Hourly partitions are created ahead of time and expired ones
+        # dropped on this interval; see _manage_partitions
+        self._partition_interval = 3600.0
+        self._last_partition_at = time.monotonic() - 3600.0
+        self._partition_retain_hours = 24
+
+        # Hourly aggregates are rebuilt from realtime_data on this interval
+        # instead of upserted per message (see rebuild_peak_hours_analysis)
+        self._rebuild_interval = 60.0
+        self._last_rebuild_at = time.monotonic() - 60.0
+
+        # Statements compiled once with named binds (same pattern as
+        # ServingLayer): repeat calls hit the engine's compiled cache
+        # instead of re-parsing the SQL string
+        self._cleanup_stmt = text("""
+        UPDATE realtime_data
+        SET is_active = FALSE
+        WHERE timestamp < :cutoff_time AND is_active = TRUE
+        """)
+        self._rebuild_stmt = text("""
+        INSERT INTO peak_hours_analysis
+        (date, hour, location, avg_traffic_level, avg_aqi_value, is_peak_hour, total_records, updated_at)
+        SELECT
+            CAST(timestamp AS DATE),
+            CAST(EXTRACT(HOUR FROM timestamp) AS INTEGER),
+            location,
+            AVG(traffic_level),
+            AVG(aqi_value),
+            BOOL_OR(is_peak_hour),
+            COUNT(*),
+            NOW()
+        FROM realtime_data
+        WHERE timestamp >= :cutoff_time
+        GROUP BY 1, 2, 3
+        ON CONFLICT (date, hour, location)
+        DO UPDATE SET
+            avg_traffic_level = EXCLUDED.avg_traffic_level,
+            avg_aqi_value = EXCLUDED.avg_aqi_value,
+            is_peak_hour = EXCLUDED.is_peak_hour,
+            total_records = EXCLUDED.total_records,
+            updated_at = NOW()
+        """)
+        self._aggregates_stmt = text("""
+        SELECT
+            location,
+            AVG(aqi_value) as avg_aqi,
+            AVG(traffic_level) as avg_traffic,
+            MAX(aqi_value) as max_aqi,
+            MAX(traffic_level) as max_traffic,
+            COUNT(*) as data_points
+        FROM realtime_data
+        WHERE timestamp >= :cutoff_time AND is_active = TRUE
+        GROUP BY location
+        """)
     
     @staticmethod
     def is_peak_hour(timestamp: datetime) -> bool:
@@ -33,10 +160,7 @@ class StreamProcessor:
         Returns:
             bool: True if during peak hours
         """
-        hour = timestamp.hour
-        morning_peak = StreamProcessor.MORNING_PEAK[0] <= hour < StreamProcessor.MORNING_PEAK[1]
-        evening_peak = StreamProcessor.EVENING_PEAK[0] <= hour < StreamProcessor.EVENING_PEAK[1]
-        return morning_peak or evening_peak
+        return bool((StreamProcessor.PEAK_MASK >> timestamp.hour) & 1)
     
     @staticmethod
     def get_aqi_category(aqi_value: int) -> str:
@@ -49,18 +173,7 @@ class StreamProcessor:
         Returns:
             str: AQI category name
         """
-        if aqi_value <= 50:
-            return "Good"
-        elif aqi_value <= 100:
-            return "Moderate"
-        elif aqi_value <= 150:
-            return "Unhealthy for Sensitive Groups"
-        elif aqi_value <= 200:
-            return "Unhealthy"
-        elif aqi_value <= 300:
-            return "Very Unhealthy"
-        else:
-            return "Hazardous"
+        return _AQI_CATEGORY_NAMES[_CATEGORY_LUT[min(max(int(aqi_value), 0), 500)]]
     
     def process_location_data(self, location_data: Dict[str, Any]) -> bool:
         """
@@ -74,9 +187,15 @@ class StreamProcessor:
             bool: True if successfully processed and stored
         """
         try:
-            # Parse ISO timestamp string
+            # Prefer epoch milliseconds (producers send timestamp_ms since
+            # the payload contract change): fromtimestamp is much cheaper
+            # than the ISO string scan. The string path stays for replays
+            # of older messages.
+            timestamp_ms = location_data.get('timestamp_ms')
             timestamp_str = location_data.get('timestamp')
-            if isinstance(timestamp_str, str):
+            if timestamp_ms is not None:
+                timestamp = datetime.fromtimestamp(timestamp_ms / 1000, tz=timezone.utc)
+            elif isinstance(timestamp_str, str):
                 timestamp = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
             else:
                 timestamp = datetime.now()
@@ -88,8 +207,9 @@ class StreamProcessor:
             aqi_value = location_data.get('aqi_value')
             aqi_category = self.get_aqi_category(aqi_value) if aqi_value else "Unknown"
             
-            # Insert into realtime_data table
-            success = self._insert_realtime_data(
+            # Insert into realtime_data table; peak_hours_analysis is
+            # rebuilt periodically from these rows (see _flush_batch)
+            return self._insert_realtime_data(
                 timestamp=timestamp,
                 location=location_data.get('location'),
                 latitude=location_data.get('latitude'),
@@ -99,56 +219,144 @@ class StreamProcessor:
                 traffic_level=location_data.get('traffic_level'),
                 is_peak_hour=is_peak
             )
-            
-            if success:
-                # Update peak hours analysis table
-                self._update_peak_hours_analysis(
-                    timestamp=timestamp,
-                    location=location_data.get('location'),
-                    aqi_value=aqi_value,
-                    traffic_level=location_data.get('traffic_level'),
-                    is_peak_hour=is_peak
-                )
-                
-                # Optionally: cleanup old real-time data (keep only last 1 hour)
-                self._cleanup_old_realtime_data(hours=1)
-            
-            return success
-            
+
         except Exception as e:
             logging.error(f"Error processing location data: {e}")
             return False
-    
-    def _insert_realtime_data(self, timestamp, location, latitude, longitude, 
+
+    def consume_in_batches(self, msg_iter, batch_size: int = None,
+                           batch_timeout: float = None):
+        """
+        Drive the speed layer from a message iterator with batched writes.
+
+        Size/time triggered flushing happens inside _insert_realtime_data;
+        this loop optionally overrides the thresholds, guarantees a final
+        flush when the iterator ends, and is where per-flush housekeeping
+        (old-row cleanup) runs instead of once per message.
+
+        None items are the consumer's empty-poll sentinel: they carry no
+        data but give the age check a chance to run, so a partial batch is
+        flushed on timeout even when no further messages arrive.
+
+        Args:
+            msg_iter: Iterable of location_data dicts (e.g. the Kafka
+                consumer), with None yielded on empty polls
+            batch_size: Optional override for the constructor batch_size
+            batch_timeout: Optional override for the constructor batch_timeout
+        """
+        if batch_size is not None:
+            self._flush_threshold = batch_size
+        if batch_timeout is not None:
+            self._batch_timeout = batch_timeout
+
+        try:
+            for location_data in msg_iter:
+                if location_data is None:
+                    if (self._first_pending_at is not None
+                            and time.monotonic() - self._first_pending_at >= self._batch_timeout):
+                        self._flush_batch()
+                    continue
+                self.process_location_data(location_data)
+        finally:
+            self._flush_batch()
+            # Wait for the writer thread to drain queued batches so nothing
+            # is lost when the consumer loop exits
+            if self._writer is not None:
+                self._write_queue.join()
+
+    def _insert_realtime_data(self, timestamp, location, latitude, longitude,
                               aqi_value, aqi_category, traffic_level, is_peak_hour) -> bool:
-        """Insert data into realtime_data table with peak hours and AQI category."""
+        """Queue a realtime_data row; rows are written in batches.
+
+        Per-message INSERT + commit round trips dominated the speed layer at
+        steady state. Rows now land in an in-process buffer and _flush_batch
+        writes the whole buffer in one round trip, triggered by size or by
+        the age of the oldest queued row.
+        """
+        self._pending.append((
+            timestamp, location, latitude, longitude,
+            aqi_value, aqi_category, traffic_level, is_peak_hour, True
+        ))
+        now = time.monotonic()
+        if self._first_pending_at is None:
+            self._first_pending_at = now
+
+        if (len(self._pending) >= self._flush_threshold
+                or now - self._first_pending_at >= self._batch_timeout):
+            return self._flush_batch()
+        return True
+
+    def _flush_batch(self) -> bool:
+        """Hand the pending rows to the writer thread.
+
+        The consumer thread only swaps buffers and enqueues; the COPY round
+        trip runs on the writer thread so message processing and database
+        I/O overlap. If the writer falls far enough behind that the handoff
+        queue stays full, the batch is written inline instead of dropped.
+        """
+        if not self._pending:
+            return True
+        batch, self._pending = self._pending, []
+        self._first_pending_at = None
+
+        if self._writer is None:
+            self._writer = threading.Thread(
+                target=self._writer_loop, daemon=True, name='realtime-writer'
+            )
+            self._writer.start()
+
+        try:
+            self._write_queue.put(batch, timeout=5)
+            return True
+        except queue.Full:
+            logging.warning("Realtime writer backlogged, writing batch inline")
+            return self._write_batch(batch)
+
+    def _writer_loop(self):
+        """Writer thread: drain handed-off batches and run housekeeping."""
+        while True:
+            batch = self._write_queue.get()
+            try:
+                self._write_batch(batch)
+            finally:
+                self._write_queue.task_done()
+
+    def _write_batch(self, batch) -> bool:
+        """Write one batch of realtime rows in a single COPY round trip."""
         conn = None
         try:
-            conn = self.db_connection.get_connection()
-            if not conn:
+            engine = self.db_connection.get_engine()
+            if not engine:
                 return False
-            
-            insert_query = text("""
-            INSERT INTO realtime_data 
-            (timestamp, location, latitude, longitude, aqi_value, aqi_category, traffic_level, is_peak_hour, is_active)
-            VALUES (:timestamp, :location, :latitude, :longitude, :aqi_value, :aqi_category, :traffic_level, :is_peak_hour, TRUE)
-            """)
-            
-            conn.execute(insert_query, {
-                'timestamp': timestamp,
-                'location': location,
-                'latitude': latitude,
-                'longitude': longitude,
-                'aqi_value': aqi_value,
-                'aqi_category': aqi_category,
-                'traffic_level': traffic_level,
-                'is_peak_hour': is_peak_hour
-            })
+
+            conn = engine.raw_connection()
+            with conn.cursor() as cursor:
+                if hasattr(cursor, 'copy_expert'):
+                    buf = io.StringIO()
+                    csv.writer(buf).writerows(batch)
+                    buf.seek(0)
+                    cursor.copy_expert(_REALTIME_COPY_SQL, buf)
+                else:
+                    execute_values(cursor, _REALTIME_INSERT_SQL, batch, page_size=100)
             conn.commit()
+
+            # Housekeeping on intervals, not per flush: the aggregate
+            # rebuild every minute, the cleanup UPDATE every five,
+            # partition maintenance every hour
+            now = time.monotonic()
+            if now - self._last_rebuild_at >= self._rebuild_interval:
+                self._last_rebuild_at = now
+                self.rebuild_peak_hours_analysis()
+            if now - self._last_cleanup_at >= self._cleanup_interval:
+                self._last_cleanup_at = now
+                self._cleanup_old_realtime_data(hours=1)
+            if now - self._last_partition_at >= self._partition_interval:
+                self._last_partition_at = now
+                self._manage_partitions()
             return True
-            
+
         except Exception as e:
-            logging.error(f"Database error in _insert_realtime_data: {e}")
+            logging.error(f"Database error in _write_batch: {e}")
             if conn:
                 conn.rollback()
             return False
@@ -156,6 +364,62 @@ class StreamProcessor:
             if conn:
                 conn.close()
     
+    def _manage_partitions(self):
+        """Create upcoming hourly partitions and drop expired ones.
+
+        realtime_data is range-partitioned by hour (see init.sql), so
+        retiring an hour of data is one DROP TABLE catalog operation
+        instead of a statement that touches every old row. Only future
+        hours get dedicated partitions — rows arriving before the first
+        managed hour land in realtime_data_default — so creation never
+        collides with rows already in the default partition.
+        """
+        try:
+            engine = self.db_connection.get_engine()
+            if not engine:
+                return
+
+            now = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+            cutoff = now - timedelta(hours=self._partition_retain_hours)
+
+            with engine.begin() as conn:
+                # Partitions for the next two hours, so one missed cycle
+                # never leaves an hour without its partition
+                for offset in (1, 2):
+                    start = now + timedelta(hours=offset)
+                    end = start + timedelta(hours=1)
+                    name = start.strftime('realtime_data_%Y%m%d%H')
+                    conn.execute(text(
+                        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF realtime_data "
+                        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+                    ))
+
+                # Drop hourly partitions that ended before the cutoff
+                rows = conn.execute(text("""
+                SELECT c.relname
+                FROM pg_inherits i
+                JOIN pg_class c ON c.oid = i.inhrelid
+                WHERE i.inhparent = 'realtime_data'::regclass
+                  AND c.relname ~ '^realtime_data_[0-9]{10}$'
+                """)).fetchall()
+                for (relname,) in rows:
+                    part_start = datetime.strptime(
+                        relname[-10:], '%Y%m%d%H'
+                    ).replace(tzinfo=timezone.utc)
+                    if part_start + timedelta(hours=1) <= cutoff:
+                        conn.execute(text(f"DROP TABLE IF EXISTS {relname}"))
+                        logging.info(f"🧹 Dropped expired partition {relname}")
+
+                # The default partition only collects pre-first-hour rows;
+                # trim it with a plain DELETE
+                conn.execute(
+                    text("DELETE FROM realtime_data_default WHERE timestamp < :cutoff"),
+                    {'cutoff': cutoff}
+                )
+
+        except Exception as e:
+            logging.error(f"Error managing realtime_data partitions: {e}")
+
     def _cleanup_old_realtime_data(self, hours: int = 1):
         """
         Clean up old real-time data to keep the table size manageable.
@@ -163,93 +427,51 @@ class StreamProcessor:
         Args:
             hours: Keep only data from the last N hours
         """
-        conn = None
         try:
-            conn = self.db_connection.get_connection()
-            if not conn:
+            engine = self.db_connection.get_engine()
+            if not engine:
                 return
-            
+
             cutoff_time = datetime.now() - timedelta(hours=hours)
-            
-            # Mark old data as inactive instead of deleting (for debugging/audit trail)
-            update_query = text("""
-            UPDATE realtime_data 
-            SET is_active = FALSE 
-            WHERE timestamp < :cutoff_time AND is_active = TRUE
-            """)
-            
-            result = conn.execute(update_query, {'cutoff_time': cutoff_time})
-            conn.commit()
-            
+
+            # Marks old data inactive instead of deleting (audit trail).
+            # engine.begin() checks a pooled connection out, commits on
+            # success and rolls back on error — no per-call connect/close
+            with engine.begin() as conn:
+                result = conn.execute(self._cleanup_stmt, {'cutoff_time': cutoff_time})
+
             if result.rowcount > 0:
                 logging.info(f"🧹 Cleaned up {result.rowcount} old realtime records")
-            
+
         except Exception as e:
             logging.error(f"Error in cleanup_old_realtime_data: {e}")
-            if conn:
-                conn.rollback()
-        finally:
-            if conn:
-                conn.close()
     
-    def _update_peak_hours_analysis(self, timestamp: datetime, location: str, 
-                                     aqi_value: int, traffic_level: int, is_peak_hour: bool):
+    def rebuild_peak_hours_analysis(self, lookback_hours: int = 2):
         """
-        Update peak_hours_analysis table with incremental aggregation.
-        This enables real-time hourly analysis from the Speed Layer.
-        
+        Rebuild recent peak_hours_analysis rows from realtime_data.
+
+        Replaces the old per-message read-modify-write UPSERT: one grouped
+        scan recomputes the affected (date, hour, location) rows exactly,
+        so there is no hot-row contention on frequent locations and no
+        running-average drift. Called on an interval from _flush_batch.
+
         Args:
-            timestamp: Data timestamp
-            location: Location name
-            aqi_value: AQI value
-            traffic_level: Traffic level
-            is_peak_hour: Whether this is peak hour
+            lookback_hours: Rebuild hours whose data falls in this window
         """
-        conn = None
         try:
-            conn = self.db_connection.get_connection()
-            if not conn:
+            engine = self.db_connection.get_engine()
+            if not engine:
                 return
-            
-            date = timestamp.date()
-            hour = timestamp.hour
-            
-            # Upsert with running average calculation
-            upsert_query = text("""
-            INSERT INTO peak_hours_analysis 
-            (date, hour, location, avg_traffic_level, avg_aqi_value, is_peak_hour, total_records, updated_at)
-            VALUES (:date, :hour, :location, :traffic, :aqi, :is_peak, 1, NOW())
-            ON CONFLICT (date, hour, location)
-            DO UPDATE SET
-                avg_traffic_level = (
-                    (peak_hours_analysis.avg_traffic_level * peak_hours_analysis.total_records + EXCLUDED.avg_traffic_level) 
-                    / (peak_hours_analysis.total_records + 1)
-                ),
-                avg_aqi_value = (
-                    (peak_hours_analysis.avg_aqi_value * peak_hours_analysis.total_records + EXCLUDED.avg_aqi_value) 
-                    / (peak_hours_analysis.total_records + 1)
-                ),
-                total_records = peak_hours_analysis.total_records + 1,
-                updated_at = NOW()
-            """)
-            
-            conn.execute(upsert_query, {
-                'date': date,
-                'hour': hour,
-                'location': location,
-                'traffic': traffic_level,
-                'aqi': aqi_value,
-                'is_peak': is_peak_hour
-            })
-            conn.commit()
-            
+
+            cutoff_time = datetime.now() - timedelta(hours=lookback_hours)
+
+            # Inactive rows are still included: they only aged out of the
+            # serving window, and the hourly averages should stay exact
+            with engine.begin() as conn:
+                conn.execute(self._rebuild_stmt, {'cutoff_time': cutoff_time})
+
         except Exception as e:
-            logging.error(f"Error updating peak_hours_analysis: {e}")
-            if conn:
-                conn.rollback()
-        finally:
-            if conn:
-                conn.close()
+            logging.error(f"Error rebuilding peak_hours_analysis: {e}")
     
     def get_recent_aggregates(self, minutes: int = 5) -> Dict[str, Any]:
         """
@@ -261,45 +483,29 @@ class StreamProcessor:
         Returns:
             Dict with aggregated statistics
         """
-        conn = None
         try:
-            conn = self.db_connection.get_connection()
-            if not conn:
+            engine = self.db_connection.get_engine()
+            if not engine:
                 return {}
-            
+
             cutoff_time = datetime.now() - timedelta(minutes=minutes)
-            
-            query = text("""
-            SELECT 
-                location,
-                AVG(aqi_value) as avg_aqi,
-                AVG(traffic_level) as avg_traffic,
-                MAX(aqi_value) as max_aqi,
-                MAX(traffic_level) as max_traffic,
-                COUNT(*) as data_points
-            FROM realtime_data
-            WHERE timestamp >= :cutoff_time AND is_active = TRUE
-            GROUP BY location
-            """)
-            
-            result = conn.execute(query, {'cutoff_time': cutoff_time})
-            rows = result.fetchall()
-            
-            aggregates = {}
-            for row in rows:
-                aggregates[row[0]] = {
-                    'avg_aqi': float(row[1]) if row[1] else 0,
-                    'avg_traffic': float(row[2]) if row[2] else 0,
-                    'max_aqi': row[3],
-                    'max_traffic': row[4],
-                    'data_points': row[5]
+
+            # Stream mapped rows straight into the result dict: no
+            # intermediate fetchall() list, and named access instead of
+            # integer subscripts per field
+            with engine.connect() as conn:
+                result = conn.execute(self._aggregates_stmt, {'cutoff_time': cutoff_time})
+                return {
+                    row['location']: {
+                        'avg_aqi': float(row['avg_aqi'] or 0),
+                        'avg_traffic': float(row['avg_traffic'] or 0),
+                        'max_aqi': row['max_aqi'],
+                        'max_traffic': row['max_traffic'],
+                        'data_points': row['data_points']
+                    }
+                    for row in result.mappings()
                 }
-            
-            return aggregates
-            
+
         except Exception as e:
             logging.error(f"Error getting recent aggregates: {e}")
             return {}
-        finally:
-            if conn:
-                conn.close()
@@ -1,61 +1,172 @@
+import numpy as np
 import pydeck as pdk
 import pandas as pd
 from datetime import datetime
 
+# Deck construction is pure compute on its inputs, so repeat Streamlit
+# reruns over an unchanged frame can serve the cached Deck instead of
+# rebuilding layers and tooltip config. Outside a Streamlit runtime the
+# builders simply run uncached.
+try:
+    import streamlit as st
+    _deck_cache = st.cache_data(ttl=30, show_spinner=False)
+except ImportError:
+    def _deck_cache(func):
+        return func
+
+
+# AQI marker palette: row i is the RGBA for category i (Good, Moderate,
+# Unhealthy for Sensitive Groups, Unhealthy, Very Unhealthy, Hazardous),
+# last row is the grey fallback for missing values
+_AQI_PALETTE = np.array([
+    [76, 175, 80, 255],    # Green
+    [255, 235, 59, 255],   # Yellow
+    [255, 152, 0, 255],    # Orange
+    [244, 67, 54, 255],    # Red
+    [156, 39, 176, 255],   # Purple
+    [126, 87, 194, 255],   # Dark Purple
+    [128, 128, 128, 255],  # Grey (missing)
+], dtype=np.uint8)
+_AQI_THRESHOLDS = np.array([50, 100, 150, 200, 300])
+
+# Traffic marker palette: row i is the RGBA for level i+1 (Lancar..Macet),
+# last row is the grey fallback for missing/out-of-range levels
+_TRAFFIC_PALETTE = np.array([
+    [76, 175, 80, 255],    # Green (Lancar)
+    [139, 195, 74, 255],   # Light Green
+    [255, 235, 59, 255],   # Yellow (Sedang)
+    [255, 152, 0, 255],    # Orange (Padat)
+    [244, 67, 54, 255],    # Red (Macet)
+    [128, 128, 128, 255],  # Grey (missing)
+], dtype=np.uint8)
+
+# Static deck configuration, built once at import instead of per render
+_MAP_STYLE = "https://basemaps.cartocdn.com/gl/dark-matter-gl-style/style.json"
+_DEFAULT_LAT = -6.200000
+_DEFAULT_LON = 106.816666
+
+_AQI_TOOLTIP = {
+    "html": """
+    <div style="background-color: rgba(0, 0, 0, 0.9); padding: 15px; border-radius: 8px;
+                color: white; font-family: Arial, sans-serif; min-width: 220px; border: 2px solid #4CAF50;">
+        <div style="font-weight: bold; font-size: 16px; margin-bottom: 10px;
+                    border-bottom: 2px solid #4CAF50; padding-bottom: 6px;">
+            📍 {location}
+        </div>
+        <div style="margin-bottom: 8px;">
+            <span style="color: #FFD700;">🌫️ AQI Value:</span>
+            <span style="font-weight: bold; font-size: 20px; color: #FFD700;">{aqi_value}</span>
+        </div>
+        <div style="margin-bottom: 8px;">
+            <span style="color: #87CEEB;">📊 Category:</span>
+            <span style="font-weight: bold;">{aqi_category}</span>
+        </div>
+        <div style="margin-bottom: 8px;">
+            <span style="color: #98FB98;">📅 Time:</span>
+            <span>{formatted_time}</span>
+        </div>
+        <div style="font-size: 10px; color: #999; margin-top: 10px; font-style: italic;">
+            Lat: {latitude}, Lon: {longitude}
+        </div>
+    </div>
+    """,
+    "style": {"backgroundColor": "transparent", "color": "white"}
+}
+
+_TRAFFIC_TOOLTIP = {
+    "html": """
+    <div style="background-color: rgba(0, 0, 0, 0.9); padding: 15px; border-radius: 8px;
+                color: white; font-family: Arial, sans-serif; min-width: 220px; border: 2px solid #2196F3;">
+        <div style="font-weight: bold; font-size: 16px; margin-bottom: 10px;
+                    border-bottom: 2px solid #2196F3; padding-bottom: 6px;">
+            📍 {location}
+        </div>
+        <div style="margin-bottom: 8px;">
+            <span style="color: #FFD700;">🚗 Traffic Level:</span>
+            <span style="font-weight: bold; font-size: 20px; color: #FFD700;">{traffic_level}</span>
+        </div>
+        <div style="margin-bottom: 8px;">
+            <span style="color: #87CEEB;">⏰ Peak Hour:</span>
+            <span style="font-weight: bold;">{is_peak_hour}</span>
+        </div>
+        <div style="margin-bottom: 8px;">
+            <span style="color: #98FB98;">📅 Time:</span>
+            <span>{formatted_time}</span>
+        </div>
+        <div style="font-size: 10px; color: #999; margin-top: 10px; font-style: italic;">
+            Lat: {latitude}, Lon: {longitude}
+        </div>
+    </div>
+    """,
+    "style": {"backgroundColor": "transparent", "color": "white"}
+}
+
+
+def _build_empty_deck() -> pdk.Deck:
+    """Layerless deck centered on Jakarta, for empty input frames."""
+    view_state = pdk.ViewState(
+        latitude=_DEFAULT_LAT,
+        longitude=_DEFAULT_LON,
+        zoom=10,
+        pitch=0,
+    )
+    return pdk.Deck(layers=[], initial_view_state=view_state, map_style=_MAP_STYLE)
+
+
+# Built once: the empty deck never varies, so every empty-data rerun can
+# hand back the same instance (callers only pass it to st.pydeck_chart,
+# which serializes without mutating)
+_EMPTY_DECK = _build_empty_deck()
+
+
+def _frame_key(data: pd.DataFrame, value_col: str) -> tuple:
+    """Cheap change-detection key for deck caching.
+
+    Length + newest timestamp + column sum catches every refresh the
+    serving layer produces without hashing the whole frame.
+    """
+    return (len(data), str(data['timestamp'].max()), float(data[value_col].sum()))
+
 
 class VisualizationService:
     """Service class for creating visualizations."""
-    
-    def __init__(self):
-        # Define AQI color scale (based on standard AQI categories)
-        self.aqi_colors = {
-            'Good': [76, 175, 80, 255],              # Green
-            'Moderate': [255, 235, 59, 255],         # Yellow
-            'Unhealthy for Sensitive Groups': [255, 152, 0, 255],  # Orange
-            'Unhealthy': [244, 67, 54, 255],         # Red
-            'Very Unhealthy': [156, 39, 176, 255],   # Purple
-            'Hazardous': [126, 87, 194, 255]         # Dark Purple
-        }
-        
-        # Define traffic color scale (1-5 levels)
-        self.traffic_colors = {
-            1: [76, 175, 80, 255],    # Green (Lancar)
-            2: [139, 195, 74, 255],   # Light Green
-            3: [255, 235, 59, 255],   # Yellow (Sedang)
-            4: [255, 152, 0, 255],    # Orange (Padat)
-            5: [244, 67, 54, 255]     # Red (Macet)
-        }
-    
+
     def get_aqi_color(self, aqi_value):
         """Get color based on AQI value."""
         if pd.isna(aqi_value):
-            return [128, 128, 128, 255]
-        
-        aqi_value = int(aqi_value)
-        if aqi_value <= 50:
-            return [76, 175, 80, 255]  # Good - Green
-        elif aqi_value <= 100:
-            return [255, 235, 59, 255]  # Moderate - Yellow
-        elif aqi_value <= 150:
-            return [255, 152, 0, 255]  # Unhealthy for Sensitive - Orange
-        elif aqi_value <= 200:
-            return [244, 67, 54, 255]  # Unhealthy - Red
-        elif aqi_value <= 300:
-            return [156, 39, 176, 255]  # Very Unhealthy - Purple
-        else:
-            return [126, 87, 194, 255]  # Hazardous - Dark Purple
-    
+            return _AQI_PALETTE[-1].tolist()
+        idx = int(np.searchsorted(_AQI_THRESHOLDS, int(aqi_value), side='left'))
+        return _AQI_PALETTE[idx].tolist()
+
     def get_traffic_color(self, traffic_level):
         """Get color based on traffic level."""
-        if pd.isna(traffic_level):
-            return [128, 128, 128, 255]
-        return self.traffic_colors.get(int(traffic_level), [128, 128, 128, 255])
-    
+        if pd.isna(traffic_level) or not 1 <= int(traffic_level) <= 5:
+            return _TRAFFIC_PALETTE[-1].tolist()
+        return _TRAFFIC_PALETTE[int(traffic_level) - 1].tolist()
+
+    @staticmethod
+    def _aqi_fill_colors(aqi_values: pd.Series) -> list:
+        """RGBA fill colors for a whole AQI column in one searchsorted pass."""
+        aqi = pd.to_numeric(aqi_values, errors='coerce').to_numpy(dtype=np.float64)
+        idx = np.searchsorted(_AQI_THRESHOLDS, aqi, side='left')
+        idx = np.where(np.isnan(aqi), len(_AQI_PALETTE) - 1, idx)
+        # pydeck wants a per-row list, so materialize the Nx4 gather once
+        return _AQI_PALETTE[idx.astype(np.intp)].tolist()
+
+    @staticmethod
+    def _traffic_fill_colors(traffic_levels: pd.Series) -> list:
+        """RGBA fill colors for a whole traffic-level column in one pass."""
+        tl = pd.to_numeric(traffic_levels, errors='coerce').to_numpy(dtype=np.float64)
+        idx = tl - 1  # levels 1-5 -> palette rows 0-4
+        bad = ~np.isfinite(tl) | (idx < 0) | (idx > 4)
+        idx = np.where(bad, len(_TRAFFIC_PALETTE) - 1, idx)
+        return _TRAFFIC_PALETTE[idx.astype(np.intp)].tolist()
+
     def format_timestamp(self, ts):
         """Format timestamp for display."""
         if pd.isna(ts):
             return "N/A"
-        
+
         try:
             if isinstance(ts, str):
                 dt = pd.to_datetime(ts)
@@ -64,204 +175,120 @@ class VisualizationService:
             return dt.strftime('%Y-%m-%d %H:%M:%S')
         except:
             return str(ts)
-    
+
+    @staticmethod
+    def _formatted_times(timestamps: pd.Series) -> pd.Series:
+        """Format a whole timestamp column with one C-level conversion.
+
+        Column counterpart of format_timestamp: one pd.to_datetime call and
+        one .dt.strftime pass instead of a per-row parse inside apply;
+        unparseable values coerce to NaT and render as N/A.
+        """
+        ts = pd.to_datetime(timestamps, errors='coerce')
+        return ts.dt.strftime('%Y-%m-%d %H:%M:%S').fillna('N/A')
+
+    @staticmethod
+    def _text_labels(values: pd.Series) -> pd.Series:
+        """Integer marker labels for a numeric column; missing values blank.
+
+        round() first: the serving layer hands these columns over as
+        float32, and pandas refuses a lossy float -> Int64 cast.
+        """
+        nums = pd.to_numeric(values, errors='coerce').round()
+        return nums.astype('Int64').astype('string').fillna('')
+
     def create_aqi_pinpoint_map(self, data) -> pdk.Deck:
         """Create AQI pinpoint map visualization with colored markers and text labels."""
         if data.empty or data['latitude'].empty or data['longitude'].empty:
-            view_state = pdk.ViewState(
-                latitude=-6.200000,
-                longitude=106.816666,
-                zoom=10,
-                pitch=0,
-            )
-            map_style = "https://basemaps.cartocdn.com/gl/dark-matter-gl-style/style.json"
-            return pdk.Deck(layers=[], initial_view_state=view_state, map_style=map_style)
-
-        # Prepare data
-        data = data.copy()
-        data['fill_color'] = data['aqi_value'].apply(self.get_aqi_color)
-        data['formatted_time'] = data['timestamp'].apply(self.format_timestamp)
-        data['text_label'] = data['aqi_value'].apply(lambda x: str(int(x)) if pd.notna(x) else "")
-        
-        # Calculate center
-        lat_mean = data['latitude'].dropna().mean()
-        lon_mean = data['longitude'].dropna().mean()
-
-        view_state = pdk.ViewState(
-            latitude=lat_mean if pd.notna(lat_mean) else -6.200000,
-            longitude=lon_mean if pd.notna(lon_mean) else 106.816666,
-            zoom=10.5,
-            pitch=0,
-        )
-
-        # ScatterplotLayer for colored circles
-        scatterplot_layer = pdk.Layer(
-            "ScatterplotLayer",
-            data=data,
-            get_position=["longitude", "latitude"],
-            get_fill_color="fill_color",
-            get_line_color=[255, 255, 255, 200],
-            get_radius=1200,
-            line_width_min_pixels=2,
-            pickable=True,
-            auto_highlight=True,
-            opacity=0.9,
-            stroked=True,
-        )
-        
-        # TextLayer for values - LARGER and WHITE
-        text_layer = pdk.Layer(
-            "TextLayer",
-            data=data,
-            get_position=["longitude", "latitude"],
-            get_text="text_label",
-            get_size=150,  # MUCH LARGER
-            get_color=[255, 255, 255, 255],  # WHITE TEXT
-            get_angle=0,
-            get_text_anchor='"middle"',
-            get_alignment_baseline='"center"',
-            pickable=False,
-            billboard=True,
-            font_family='"Arial Black", sans-serif',
-            font_weight=500,
-        )
-
-        map_style = "https://basemaps.cartocdn.com/gl/dark-matter-gl-style/style.json"
-
-        return pdk.Deck(
-            layers=[scatterplot_layer, text_layer],
-            initial_view_state=view_state,
-            map_style=map_style,
-            tooltip={
-                "html": """
-                <div style="background-color: rgba(0, 0, 0, 0.9); padding: 15px; border-radius: 8px; 
-                            color: white; font-family: Arial, sans-serif; min-width: 220px; border: 2px solid #4CAF50;">
-                    <div style="font-weight: bold; font-size: 16px; margin-bottom: 10px; 
-                                border-bottom: 2px solid #4CAF50; padding-bottom: 6px;">
-                        📍 {location}
-                    </div>
-                    <div style="margin-bottom: 8px;">
-                        <span style="color: #FFD700;">🌫️ AQI Value:</span> 
-                        <span style="font-weight: bold; font-size: 20px; color: #FFD700;">{aqi_value}</span>
-                    </div>
-                    <div style="margin-bottom: 8px;">
-                        <span style="color: #87CEEB;">📊 Category:</span> 
-                        <span style="font-weight: bold;">{aqi_category}</span>
-                    </div>
-                    <div style="margin-bottom: 8px;">
-                        <span style="color: #98FB98;">📅 Time:</span> 
-                        <span>{formatted_time}</span>
-                    </div>
-                    <div style="font-size: 10px; color: #999; margin-top: 10px; font-style: italic;">
-                        Lat: {latitude}, Lon: {longitude}
-                    </div>
-                </div>
-                """,
-                "style": {"backgroundColor": "transparent", "color": "white"}
-            }
-        )
+            return _EMPTY_DECK
+        return _build_pinpoint_deck(_frame_key(data, 'aqi_value'), data, 'aqi_value')
 
     def create_traffic_pinpoint_map(self, data) -> pdk.Deck:
         """Create traffic pinpoint map visualization with colored markers and text labels."""
         if data.empty or data['latitude'].empty or data['longitude'].empty:
-            view_state = pdk.ViewState(
-                latitude=-6.200000,
-                longitude=106.816666,
-                zoom=10,
-                pitch=0,
-            )
-            map_style = "https://basemaps.cartocdn.com/gl/dark-matter-gl-style/style.json"
-            return pdk.Deck(layers=[], initial_view_state=view_state, map_style=map_style)
-
-        # Prepare data
-        data = data.copy()
-        data['fill_color'] = data['traffic_level'].apply(self.get_traffic_color)
-        data['formatted_time'] = data['timestamp'].apply(self.format_timestamp)
-        data['text_label'] = data['traffic_level'].apply(lambda x: str(int(x)) if pd.notna(x) else "")
-        
-        # Calculate center
-        lat_mean = data['latitude'].dropna().mean()
-        lon_mean = data['longitude'].dropna().mean()
-
-        view_state = pdk.ViewState(
-            latitude=lat_mean if pd.notna(lat_mean) else -6.200000,
-            longitude=lon_mean if pd.notna(lon_mean) else 106.816666,
-            zoom=10.5,
-            pitch=0,
-        )
-
-        # ScatterplotLayer for colored circles
-        scatterplot_layer = pdk.Layer(
-            "ScatterplotLayer",
-            data=data,
-            get_position=["longitude", "latitude"],
-            get_fill_color="fill_color",
-            get_line_color=[255, 255, 255, 200],
-            get_radius=1200,
-            line_width_min_pixels=2,
-            pickable=True,
-            auto_highlight=True,
-            opacity=0.9,
-            stroked=True,
-        )
-        
-        # TextLayer for values - LARGER and WHITE
-        text_layer = pdk.Layer(
-            "TextLayer",
-            data=data,
-            get_position=["longitude", "latitude"],
-            get_text="text_label",
-            get_size=150,  # MUCH LARGER
-            get_color=[255, 255, 255, 255],  # WHITE TEXT
-            get_angle=0,
-            get_text_anchor='"middle"',
-            get_alignment_baseline='"center"',
-            pickable=False,
-            billboard=True,
-            font_family='"Arial Black", sans-serif',
-            font_weight=500,
-        )
-
-        map_style = "https://basemaps.cartocdn.com/gl/dark-matter-gl-style/style.json"
-
-        return pdk.Deck(
-            layers=[scatterplot_layer, text_layer],
-            initial_view_state=view_state,
-            map_style=map_style,
-            tooltip={
-                "html": """
-                <div style="background-color: rgba(0, 0, 0, 0.9); padding: 15px; border-radius: 8px; 
-                            color: white; font-family: Arial, sans-serif; min-width: 220px; border: 2px solid #2196F3;">
-                    <div style="font-weight: bold; font-size: 16px; margin-bottom: 10px; 
-                                border-bottom: 2px solid #2196F3; padding-bottom: 6px;">
-                        📍 {location}
-                    </div>
-                    <div style="margin-bottom: 8px;">
-                        <span style="color: #FFD700;">🚗 Traffic Level:</span> 
-                        <span style="font-weight: bold; font-size: 20px; color: #FFD700;">{traffic_level}</span>
-                    </div>
-                    <div style="margin-bottom: 8px;">
-                        <span style="color: #87CEEB;">⏰ Peak Hour:</span> 
-                        <span style="font-weight: bold;">{is_peak_hour}</span>
-                    </div>
-                    <div style="margin-bottom: 8px;">
-                        <span style="color: #98FB98;">📅 Time:</span> 
-                        <span>{formatted_time}</span>
-                    </div>
-                    <div style="font-size: 10px; color: #999; margin-top: 10px; font-style: italic;">
-                        Lat: {latitude}, Lon: {longitude}
-                    </div>
-                </div>
-                """,
-                "style": {"backgroundColor": "transparent", "color": "white"}
-            }
-        )
-    
+            return _EMPTY_DECK
+        return _build_pinpoint_deck(_frame_key(data, 'traffic_level'), data, 'traffic_level')
+
     # Keep old methods for backward compatibility
     def create_aqi_heatmap(self, data) -> pdk.Deck:
         """Legacy method - redirects to pinpoint map."""
         return self.create_aqi_pinpoint_map(data)
-    
+
     def create_traffic_heatmap(self, data) -> pdk.Deck:
         """Legacy method - redirects to pinpoint map."""
-        return self.create_traffic_pinpoint_map(data)
\ No newline at end of file
+        return self.create_traffic_pinpoint_map(data)
+
+
+def _pinpoint_layers(data: pd.DataFrame) -> list:
+    """Scatterplot + text layers shared by both pinpoint maps."""
+    scatterplot_layer = pdk.Layer(
+        "ScatterplotLayer",
+        data=data,
+        get_position=["longitude", "latitude"],
+        get_fill_color="fill_color",
+        get_line_color=[255, 255, 255, 200],
+        get_radius=1200,
+        line_width_min_pixels=2,
+        pickable=True,
+        auto_highlight=True,
+        opacity=0.9,
+        stroked=True,
+    )
+
+    # TextLayer for values - LARGER and WHITE
+    text_layer = pdk.Layer(
+        "TextLayer",
+        data=data,
+        get_position=["longitude", "latitude"],
+        get_text="text_label",
+        get_size=150,  # MUCH LARGER
+        get_color=[255, 255, 255, 255],  # WHITE TEXT
+        get_angle=0,
+        get_text_anchor='"middle"',
+        get_alignment_baseline='"center"',
+        pickable=False,
+        billboard=True,
+        font_family='"Arial Black", sans-serif',
+        font_weight=500,
+    )
+    return [scatterplot_layer, text_layer]
+
+
+def _centered_view_state(data: pd.DataFrame) -> pdk.ViewState:
+    """View state centered on the mean marker position."""
+    # One NaN-skipping reduction over both columns; dropna() would copy
+    # each column just to average it
+    means = data[['latitude', 'longitude']].mean()
+    lat_mean, lon_mean = means['latitude'], means['longitude']
+    return pdk.ViewState(
+        latitude=lat_mean if pd.notna(lat_mean) else _DEFAULT_LAT,
+        longitude=lon_mean if pd.notna(lon_mean) else _DEFAULT_LON,
+        zoom=10.5,
+        pitch=0,
+    )
+
+
+# The AQI and traffic maps differ only in which column drives the markers;
+# everything varying is looked up here by value column
+_PINPOINT_VARIANTS = {
+    'aqi_value': (VisualizationService._aqi_fill_colors, _AQI_TOOLTIP),
+    'traffic_level': (VisualizationService._traffic_fill_colors, _TRAFFIC_TOOLTIP),
+}
+
+
+@_deck_cache
+def _build_pinpoint_deck(frame_key: tuple, _data: pd.DataFrame, value_col: str) -> pdk.Deck:
+    """Build a pinpoint deck; frame_key drives caching, _data is not hashed."""
+    fill_colors, tooltip = _PINPOINT_VARIANTS[value_col]
+
+    data = _data.copy()
+    data['fill_color'] = fill_colors(data[value_col])
+    data['formatted_time'] = VisualizationService._formatted_times(data['timestamp'])
+    data['text_label'] = VisualizationService._text_labels(data[value_col])
+
+    return pdk.Deck(
+        layers=_pinpoint_layers(data),
+        initial_view_state=_centered_view_state(data),
+        map_style=_MAP_STYLE,
+        tooltip=tooltip,
+    )
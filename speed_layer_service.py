@@ -26,25 +26,11 @@ def main():
         print("🚀 Speed Layer Service Started (Kafka Consumer + Stream Processing)...")
         print("👂 Listening for messages from Kafka...")
         
-        # Consume and process messages
-        for location_data in kafka_consumer.consume_location_data():
-            try:
-                # Process the message through stream processor
-                success = stream_processor.process_location_data(location_data)
-                
-                if success:
-                    logging.info(
-                        f"✅ Processed: {location_data.get('location')} "
-                        f"| AQI: {location_data.get('aqi_value')} "
-                        f"| Traffic: {location_data.get('traffic_level')}"
-                    )
-                else:
-                    logging.warning(f"⚠️ Failed to process: {location_data.get('location')}")
-                    
-            except Exception as e:
-                logging.error(f"❌ Error processing message: {e}")
-                continue
-                
+        # Consume and process messages (writes are batched inside the
+        # processor and flushed by size or timeout)
+        stream_processor.consume_in_batches(kafka_consumer.consume_location_data())
+
+
     except KeyboardInterrupt:
         print("\n🛑 Shutting down Speed Layer service...")
         kafka_consumer.close()
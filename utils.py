@@ -1,10 +1,31 @@
 import os
+from bisect import bisect_left
 from dotenv import load_dotenv
 from models.data_models import APIConfiguration
 from datetime import datetime, timezone, timedelta
+import numpy as np
 import pandas as pd
 
 
+# AQI buckets with display colors; scalar lookups bisect the bounds, array
+# lookups go through np.searchsorted in get_aqi_category_vec
+_AQI_BOUNDS = (50, 100, 150, 200, 300)
+_AQI_CATEGORIES = (
+    "Good",
+    "Moderate",
+    "Unhealthy for Sensitive Groups",
+    "Unhealthy",
+    "Very Unhealthy",
+    "Hazardous",
+)
+_AQI_COLORS = ("#4CAF50", "#FFEB3B", "#FF9800", "#F44336", "#9C27B0", "#7B1FA2")
+_AQI_CATEGORY_ARR = np.array(_AQI_CATEGORIES, dtype=object)
+_AQI_COLOR_ARR = np.array(_AQI_COLORS, dtype=object)
+
+# UTC+7, built once; Jakarta does not observe DST so a fixed offset is exact
+JAKARTA_TZ = timezone(timedelta(hours=7))
+
+
 def load_configuration():
     """Load configuration from environment variables or .env file."""
     load_dotenv()
@@ -23,37 +44,51 @@ def load_configuration():
 
 def get_jakarta_timezone():
     """Get UTC+7 timezone for Jakarta."""
-    return timezone(timedelta(hours=7))
+    return JAKARTA_TZ
+
+
+def format_datetime_series(series: pd.Series) -> pd.Series:
+    """Vectorized format_datetime_for_display for whole columns.
+
+    One tz-localize/convert and one strftime pass at C speed instead of a
+    Python call per row; unparseable values render as N/A.
+    """
+    ts = pd.to_datetime(series, errors='coerce')
+    if ts.dt.tz is None:
+        ts = ts.dt.tz_localize('UTC')
+    ts = ts.dt.tz_convert(JAKARTA_TZ)
+    return ts.dt.strftime('%Y-%m-%d %H:%M:%S WIB').fillna('N/A')
 
 
 def format_datetime_for_display(dt):
     """Format datetime for display in the UI with UTC+7 timezone."""
+    if isinstance(dt, pd.Series):
+        return format_datetime_series(dt)
     if isinstance(dt, str):
         return dt
     else:
         # Convert to UTC+7 if not already timezone-aware
-        jakarta_tz = get_jakarta_timezone()
         if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc).astimezone(jakarta_tz)
+            dt = dt.replace(tzinfo=timezone.utc).astimezone(JAKARTA_TZ)
         else:
-            dt = dt.astimezone(jakarta_tz)
+            dt = dt.astimezone(JAKARTA_TZ)
         return dt.strftime('%Y-%m-%d %H:%M:%S WIB')
 
 
 def get_aqi_category(aqi_value):
     """Get AQI category and color based on value."""
-    if aqi_value <= 50:
-        return "Good", "#4CAF50"
-    elif aqi_value <= 100:
-        return "Moderate", "#FFEB3B"
-    elif aqi_value <= 150:
-        return "Unhealthy for Sensitive Groups", "#FF9800"
-    elif aqi_value <= 200:
-        return "Unhealthy", "#F44336"
-    elif aqi_value <= 300:
-        return "Very Unhealthy", "#9C27B0"
-    else:
-        return "Hazardous", "#7B1FA2"
+    idx = bisect_left(_AQI_BOUNDS, aqi_value)
+    return _AQI_CATEGORIES[idx], _AQI_COLORS[idx]
+
+
+def get_aqi_category_vec(aqi_values):
+    """Vectorized get_aqi_category for whole arrays.
+
+    One searchsorted pass replaces a Python branch chain per row; returns
+    (categories, colors) ndarrays aligned with the input.
+    """
+    idx = np.searchsorted(np.asarray(_AQI_BOUNDS), np.asarray(aqi_values), side='left')
+    return _AQI_CATEGORY_ARR[idx], _AQI_COLOR_ARR[idx]
 
 
 def analyze_peak_hours(df):
@@ -61,32 +96,23 @@ def analyze_peak_hours(df):
     if df.empty:
         return None
     
-    # Make a copy to avoid modifying original
-    df_analysis = df.copy()
-    
-    # Convert timestamp to datetime if it's not already
-    if not pd.api.types.is_datetime64_any_dtype(df_analysis['timestamp']):
-        df_analysis['timestamp'] = pd.to_datetime(df_analysis['timestamp'])
-    
-    # Convert to UTC+7 timezone
-    jakarta_tz = get_jakarta_timezone()
-    
-    # Check if already timezone-aware
-    if df_analysis['timestamp'].dt.tz is None:
-        # Not timezone-aware, localize first
-        df_analysis['timestamp_jakarta'] = df_analysis['timestamp'].dt.tz_localize('UTC').dt.tz_convert(jakarta_tz)
-    else:
-        # Already timezone-aware, just convert
-        df_analysis['timestamp_jakarta'] = df_analysis['timestamp'].dt.tz_convert(jakarta_tz)
-    
-    # Extract hour
-    df_analysis['hour'] = df_analysis['timestamp_jakarta'].dt.hour
-    
-    # Group by hour and calculate averages
-    hourly_stats = df_analysis.groupby('hour').agg({
-        'aqi_value': 'mean',
-        'traffic_level': 'mean'
-    }).round(2)
+    # No frame copy: only the hour is derived, so work on extracted
+    # columns. utc=True localizes naive timestamps and converts aware
+    # ones in a single call.
+    ts = pd.to_datetime(df['timestamp'], utc=True)
+
+    # Jakarta (UTC+7) hour via integer arithmetic on the epoch — no
+    # tz-converted datetime column is materialized just to read .dt.hour
+    hours = (ts.astype('int64') // 3_600_000_000_000 + 7) % 24
+
+    # Group a minimal three-column frame by hour and average. Narrow dtypes
+    # halve the bytes scanned, and sort=False keeps the groupby hash-based;
+    # sort_index() afterwards restores chart order over at most 24 rows.
+    hourly_stats = pd.DataFrame({
+        'hour': hours.to_numpy(dtype=np.int8),
+        'aqi_value': df['aqi_value'].to_numpy(dtype=np.float32),
+        'traffic_level': df['traffic_level'].to_numpy(dtype=np.float32),
+    }).groupby('hour', sort=False, observed=True).mean().sort_index().round(2)
     
     # Find peak hours
     peak_aqi_hour = hourly_stats['aqi_value'].idxmax()